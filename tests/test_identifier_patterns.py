@@ -0,0 +1,40 @@
+from verifhir.rules.gdpr_free_text_identifier_rule import GDPRFreeTextIdentifierRule
+from verifhir.rules.utils.identifier_patterns import (
+    IDENTIFIER_REGEX, has_identifier_keyword, scan_identifiers, scan_note_batch,
+)
+
+
+def test_scan_reports_every_jurisdictional_label_in_one_pass():
+    labels = scan_identifiers("Patient ID 12345 referred, CPF: 123.456.789-00")
+
+    assert labels == {"patient_id", "mrn", "cpf"}
+
+
+def test_patient_id_label_stays_case_sensitive():
+    assert scan_identifiers("patient id 12345") == {"mrn"}
+
+
+def test_mrn_and_cpf_labels_agree_with_identifier_regex():
+    for text in ["MRN# 555", "ssn 123-45-6789", "cpf 1.2", "no identifiers"]:
+        found = bool(scan_identifiers(text) & {"mrn", "cpf"})
+        assert found == bool(IDENTIFIER_REGEX.search(text))
+
+
+def test_keyword_prefilter_never_rejects_a_regex_match():
+    for text in ["Patient ID 12345", "MRN# 555", "CPF 1.2", "SSN 1", "İD 12345", "ſsn 1"]:
+        assert scan_identifiers(text)
+        assert has_identifier_keyword(text)
+
+    assert not has_identifier_keyword("Stable vitals, no complaints.")
+
+
+def test_batch_scan_flags_each_note_like_a_per_note_search():
+    texts = ["Patient ID 12345", "Stable vitals", "", "mrn# 555", "İD 7"]
+
+    assert scan_note_batch(texts) == [bool(IDENTIFIER_REGEX.search(t)) for t in texts]
+
+
+def test_unicode_case_variant_identifier_still_reported():
+    violations = GDPRFreeTextIdentifierRule().evaluate({"note": [{"text": "İD 12345"}]})
+
+    assert len(violations) == 1
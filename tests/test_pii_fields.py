@@ -0,0 +1,46 @@
+from verifhir.rules.utils.pii_fields import iter_pii_texts
+
+
+def test_only_pii_bearing_fields_are_yielded():
+    resource = {
+        "resourceType": "Observation",
+        "status": "final",
+        "meta": {"consent_status": "Patient ID 1"},
+        "note": [{"text": "Patient ID 12345"}],
+        "identifier": [{"system": "urn:mrn", "value": "998877"}],
+        "code": {"text": "Blood pressure"},
+    }
+
+    assert list(iter_pii_texts(resource)) == [
+        "urn:mrn 998877",
+        "Patient ID 12345",
+        "Blood pressure",
+    ]
+
+
+def test_bundle_entries_and_narrative_are_walked():
+    bundle = {
+        "resourceType": "Bundle",
+        "entry": [
+            {"resource": {"note": [{"text": "MRN: 123456"}]}},
+            {"resource": {"resourceType": "DocumentReference", "text": {"div": "raw upload"}}},
+        ],
+    }
+
+    assert list(iter_pii_texts(bundle)) == ["MRN: 123456", "raw upload"]
+
+
+def test_patient_demographics_are_walked():
+    patient = {
+        "resourceType": "Patient",
+        "gender": "female",
+        "name": [{"family": "Carter", "given": ["Melissa", "Anne"]}],
+        "address": [{"line": ["902 Willow Creek Drive"], "city": "Plano", "country": "USA"}],
+        "telecom": [{"system": "phone", "value": "(469) 555-9082"}],
+        "extension": [{"url": "urn:nickname", "valueString": "Mel"}],
+    }
+
+    assert list(iter_pii_texts(patient)) == [
+        "Carter", "Melissa", "Anne", "902 Willow Creek Drive", "Plano",
+        "(469) 555-9082", "Mel",
+    ]
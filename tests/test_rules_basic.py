@@ -1,3 +1,6 @@
+import pytest
+
+from verifhir.rules.base_free_text_identifier_rule import BaseFreeTextIdentifierRule
 from verifhir.rules.gdpr import GDPRFreeTextIdentifierRule
 
 
@@ -14,3 +17,25 @@ def test_gdpr_rule_detects_numeric_text():
 
     assert len(violations) == 1
     assert violations[0].regulation == "GDPR"
+
+
+def test_gdpr_rule_attributes_hits_per_note():
+    rule = GDPRFreeTextIdentifierRule()
+
+    fake_fhir = {
+        "note": [
+            {"text": "Patient ID 12345 reported symptoms"},
+            {"text": "No identifiers here"},
+            {"text": "MRN: 998877"},
+        ]
+    }
+
+    violations = rule.evaluate(fake_fhir)
+
+    assert len(violations) == 2
+
+
+def test_free_text_rule_requires_configuration():
+    with pytest.raises(TypeError):
+        class IncompleteRule(BaseFreeTextIdentifierRule):
+            REGULATION = "GDPR"
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from verifhir.remediation import smart_redaction
+from verifhir.remediation.smart_redaction import (
+    _CHUNKING_MIN_CHARS,
+    _MAX_COMPLETION_TOKENS,
+    _MAX_PROMPT_TOKENS,
+    _SYSTEM_PROMPT,
+    _build_result,
+    _completion_params,
+    _count_tokens,
+    _select_candidate_chunks,
+    _stitch_chunks,
+    suggest_smart_redaction_async,
+    suggest_smart_redaction_many,
+)
+
+FILLER = "stable overnight, no acute events. " * 60
+
+
+def _long_note(*paragraphs):
+    text = "\n\n".join(paragraphs)
+    assert len(text) >= _CHUNKING_MIN_CHARS
+    return text
+
+
+def test_short_text_is_sent_whole():
+    text = "Seen by John Smith.\n\nno acute events."
+
+    chunks, candidates = _select_candidate_chunks(text)
+
+    assert candidates == [0, 1]
+    assert _stitch_chunks(chunks, candidates, "Seen by [NAME].\n\nno acute events.") == (
+        "Seen by [NAME].\n\nno acute events."
+    )
+
+
+def test_text_without_candidates_is_not_sent():
+    for text in ("no acute events.", _long_note(*[FILLER] * 4)):
+        assert _select_candidate_chunks(text)[1] == []
+
+
+def test_candidate_paragraphs_are_stitched_back_by_index():
+    text = _long_note(FILLER, "MRN 123456 on file.", FILLER, FILLER, "Call jane@example.org")
+
+    chunks, candidates = _select_candidate_chunks(text)
+    stitched = _stitch_chunks(chunks, candidates, "MRN [REDACTED] on file.\n\nCall [EMAIL]")
+
+    assert candidates == [1, 4]
+    assert stitched == _long_note(FILLER, "MRN [REDACTED] on file.", FILLER, FILLER, "Call [EMAIL]")
+
+
+def test_changed_paragraph_count_falls_back_to_deterministic_redaction():
+    text = _long_note(FILLER, "MRN 123456 on file.", FILLER, "Call jane@example.org")
+    chunks, candidates = _select_candidate_chunks(text)
+    merged = "MRN [REDACTED] on file. Call [EMAIL]"
+
+    assert _stitch_chunks(chunks, candidates, merged) is None
+
+    result = _build_result(text, "HIPAA", chunks, candidates, json.dumps({"redacted": merged}))
+    assert result["reasoning"].startswith("Fallback-generated")
+    assert FILLER.strip() in result["redacted_text"]
+
+
+def test_lone_names_are_sent_to_the_model():
+    text = _long_note(FILLER, "John was admitted overnight.", FILLER)
+
+    assert _select_candidate_chunks(text)[1] == [1]
+
+
+def test_skipped_paragraphs_get_deterministic_redaction(monkeypatch):
+    monkeypatch.setattr(
+        smart_redaction,
+        "_fallback_redaction",
+        lambda text, regulation: {"redacted_text": f"[{regulation}]"},
+    )
+    text = _long_note(FILLER, "MRN 123456 on file.", FILLER)
+    chunks, candidates = _select_candidate_chunks(text)
+    response = json.dumps({"redacted": "MRN [REDACTED] on file."})
+
+    result = _build_result(text, "GDPR", chunks, candidates, response)
+
+    assert result["redacted_text"] == "[GDPR]\n\nMRN [REDACTED] on file.\n\n[GDPR]"
+
+
+@pytest.fixture
+def encoding(monkeypatch, request):
+    """Token counting with a word-splitting stand-in for tiktoken, or None."""
+    fake = SimpleNamespace(encode=str.split) if request.param else None
+    monkeypatch.setattr(smart_redaction, "_get_encoding", lambda: fake)
+    smart_redaction._system_prompt_tokens.cache_clear()
+    yield fake
+    smart_redaction._system_prompt_tokens.cache_clear()
+
+
+@pytest.mark.parametrize("encoding", [True], indirect=True)
+def test_token_count_uses_tiktoken_encoding(encoding):
+    assert _count_tokens("Seen by John Smith") == 4
+    assert smart_redaction._system_prompt_tokens() == len(_SYSTEM_PROMPT.split())
+
+
+@pytest.mark.parametrize("encoding", [False], indirect=True)
+def test_token_count_estimates_without_tiktoken(encoding):
+    assert _count_tokens("x" * 40) == 11
+    assert smart_redaction._system_prompt_tokens() == len(_SYSTEM_PROMPT) // 4 + 1
+
+
+@pytest.mark.parametrize("encoding", [True, False], indirect=True)
+def test_completion_params_respect_token_budget(encoding):
+    params = _completion_params("MRN 123456 on file.", [])
+    assert params["max_tokens"] == _MAX_COMPLETION_TOKENS
+
+    too_long = "word " * (4 * _MAX_PROMPT_TOKENS)
+    assert _completion_params(too_long, []) is None
+
+
+def test_encoding_is_not_downloaded_when_uncached(monkeypatch, tmp_path):
+    loaded = []
+    fake_tiktoken = SimpleNamespace(get_encoding=lambda name: loaded.append(name) or name)
+    monkeypatch.setitem(sys.modules, "tiktoken", fake_tiktoken)
+    monkeypatch.setenv("TIKTOKEN_CACHE_DIR", str(tmp_path))
+    smart_redaction._get_encoding.cache_clear()
+
+    try:
+        assert smart_redaction._get_encoding() is None
+        assert loaded == []
+
+        # Table already in tiktoken's cache (a stand-in file is enough here)
+        open(smart_redaction._tiktoken_cache_path(), "wb").close()
+        smart_redaction._get_encoding.cache_clear()
+        assert smart_redaction._get_encoding() == "o200k_base"
+    finally:
+        smart_redaction._get_encoding.cache_clear()
+
+
+class _FakeAsyncClient:
+    """AsyncAzureOpenAI stand-in that echoes the prompt's text, redacted."""
+
+    def __init__(self, clients):
+        clients.append(self)
+        self.closed = False
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, messages, **_):
+        prompt = messages[1]["content"].split("\n\n")[1]
+        content = json.dumps({"redacted": prompt.replace("123456", "[REDACTED]")})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+
+
+@pytest.fixture
+def async_clients(monkeypatch):
+    clients = []
+    monkeypatch.setattr(smart_redaction, "_get_async_client", lambda: _FakeAsyncClient(clients))
+    return clients
+
+
+def test_async_redaction_closes_its_client(async_clients):
+    result = asyncio.run(suggest_smart_redaction_async("MRN 123456", [], "HIPAA"))
+
+    assert result["redacted_text"] == "MRN [REDACTED]"
+    assert [c.closed for c in async_clients] == [True]
+
+
+def test_many_shares_one_client_and_closes_it(async_clients):
+    items = [("MRN 123456", [], "HIPAA"), ("no acute events.", [], "HIPAA"), ("ID 123456", [], "GDPR")]
+
+    results = asyncio.run(suggest_smart_redaction_many(items, concurrency=2))
+
+    assert [r["redacted_text"] for r in results] == ["MRN [REDACTED]", "no acute events.", "ID [REDACTED]"]
+    assert [c.closed for c in async_clients] == [True]
@@ -0,0 +1,386 @@
+import asyncio
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from verifhir import storage
+from verifhir.audit.hash_utils import compute_audit_hash
+from verifhir.risk.components import build_risk_component
+from verifhir.models.violation import Violation, ViolationSeverity
+from verifhir.storage import (
+    AsyncAuditStorage,
+    AuditStorage,
+    _dumps_line,
+    _loads,
+    _to_plain,
+    _verify_log_chunks,
+    commit_record,
+)
+
+
+def test_to_plain_matches_json_ready_builtins():
+    violation = Violation(
+        violation_type="GDPR_IDENTIFIER",
+        severity=ViolationSeverity.MAJOR,
+        regulation="GDPR",
+        citation="GDPR Article 9",
+        field_path="note.text",
+        description="Identifier",
+        detection_method="rule-based",
+    )
+    payload = {
+        "timestamp": datetime(2025, 1, 1, 0, 0, 0),
+        "detections": (violation,),
+    }
+
+    plain = _to_plain(payload)
+
+    assert plain["timestamp"] == "2025-01-01T00:00:00"
+    assert plain["detections"][0]["severity"] == "MAJOR"
+    assert plain["detections"][0]["rule_id"] is None
+    assert json.loads(json.dumps(plain)) == plain
+
+
+def test_to_plain_keeps_lazily_computed_explanation():
+    violation = Violation(
+        violation_type="GDPR_IDENTIFIER",
+        severity=ViolationSeverity.MAJOR,
+        regulation="GDPR",
+        citation="GDPR Article 9",
+        field_path="note.text",
+        description="Identifier",
+        detection_method="rule-based",
+    )
+
+    plain = _to_plain(build_risk_component(violation))
+
+    assert plain["explanation"] == "GDPR violation (GDPR Article 9) at note.text"
+    assert plain["violation"]["regulation"] == "GDPR"
+
+
+def test_vault_commit_writes_readable_json(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    record_id = commit_record("MRN 12345 São Paulo", "[REDACTED] São Paulo", {"k": "v"})
+
+    written = json.loads(
+        (tmp_path / "secure_vault" / f"record_{record_id}.json").read_text(encoding="utf-8")
+    )
+    assert written["data"]["redacted_text"] == "[REDACTED] São Paulo"
+    assert written["metadata"] == {"k": "v"}
+
+
+def test_audit_log_lines_are_single_line_and_round_trip():
+    record = {"audit_id": "a-1", "note": "line one\nline two", "record_hash": "h1"}
+    line = _dumps_line(record)
+
+    assert line.endswith(b"\n")
+    assert line.count(b"\n") == 1
+    assert _loads(line) == record
+
+
+def test_chain_verification_streams_across_chunk_boundaries():
+    records, previous = [], None
+    for i in range(3):
+        record = {"audit_id": f"a-{i}", "previous_record_hash": previous}
+        record["record_hash"] = previous = compute_audit_hash(record)
+        records.append(record)
+    log = b"".join(_dumps_line(r) for r in records)
+
+    # Split mid-line to exercise the carried-over remainder
+    assert _verify_log_chunks([log[:7], log[7:40], log[40:]]) == 3
+
+    records[2]["previous_record_hash"] = "forged"
+    records[2]["record_hash"] = compute_audit_hash(records[2])
+    forged = b"".join(_dumps_line(r) for r in records)
+    with pytest.raises(ValueError, match="chain broken at record 2"):
+        _verify_log_chunks([forged])
+
+
+class _ResourceNotFoundError(Exception):
+    pass
+
+
+class _ResourceExistsError(Exception):
+    pass
+
+
+class _ResourceModifiedError(Exception):
+    pass
+
+
+class _FakeBlob:
+    """In-memory append blob with the calls AuditStorage makes."""
+
+    def __init__(self, container, name):
+        self.container = container
+        self.name = name
+
+    def create_append_blob(self, match_condition=None):
+        self.container.creates += 1
+        if self.name in self.container.blobs:
+            raise _ResourceExistsError(self.name)
+        self.container.blobs[self.name] = bytearray()
+
+    def append_block(self, data, length=None, appendpos_condition=None):
+        assert length == len(data)
+        self.container.before_append()
+        self.container.append_calls += 1
+        if self.container.append_calls in self.container.failing_calls:
+            raise IOError("append failed")
+        blob = self.container.blobs[self.name]
+        if appendpos_condition is not None and appendpos_condition != len(blob):
+            raise _ResourceModifiedError(self.name)
+        blob += data
+
+    def get_blob_properties(self):
+        if self.name not in self.container.blobs:
+            raise _ResourceNotFoundError(self.name)
+        return SimpleNamespace(size=len(self.container.blobs[self.name]))
+
+    def download_blob(self, offset=0, length=None):
+        if self.name not in self.container.blobs:
+            raise _ResourceNotFoundError(self.name)
+        blob = self.container.blobs[self.name]
+        length = len(blob) - offset if length is None else length
+        self.container.downloads.append(length)
+        data = bytes(blob[offset:offset + length])
+        return SimpleNamespace(readall=lambda: data, chunks=lambda: iter([data]))
+
+
+class _FakeAsyncBlob(_FakeBlob):
+    async def create_append_blob(self, match_condition=None):
+        super().create_append_blob(match_condition)
+
+    async def append_block(self, data, length=None, appendpos_condition=None):
+        super().append_block(data, length, appendpos_condition)
+
+    async def get_blob_properties(self):
+        return super().get_blob_properties()
+
+    async def download_blob(self, offset, length):
+        data = super().download_blob(offset, length).readall()
+
+        class _Downloader:
+            async def readall(self):
+                return data
+
+        return _Downloader()
+
+
+class _FakeContainer:
+    def __init__(self, blob_type):
+        self.blob_type = blob_type
+        self.blobs = {}
+        self.creates = 0
+        self.append_calls = 0
+        self.failing_calls = set()
+        self.downloads = []
+        self.before_append = lambda: None
+
+    def get_blob_client(self, name):
+        return self.blob_type(self, name)
+
+    async def close(self):
+        pass
+
+
+def _fake_sdk(container):
+    return SimpleNamespace(
+        MatchConditions=SimpleNamespace(IfMissing=object()),
+        ResourceExistsError=_ResourceExistsError,
+        ResourceModifiedError=_ResourceModifiedError,
+        ResourceNotFoundError=_ResourceNotFoundError,
+        ContainerClient=SimpleNamespace(from_connection_string=lambda **_: container),
+    )
+
+
+@pytest.fixture
+def container(monkeypatch):
+    container = _FakeContainer(_FakeBlob)
+    monkeypatch.setattr(storage, "_azure_blob_sdk", lambda: _fake_sdk(container))
+    return container
+
+
+@pytest.fixture
+def async_container(monkeypatch):
+    container = _FakeContainer(_FakeAsyncBlob)
+    monkeypatch.setattr(storage, "_azure_blob_aio_sdk", lambda: _fake_sdk(container))
+    return container
+
+
+def _chain(dataset, count, previous=None):
+    records = []
+    for i in range(count):
+        record = SimpleNamespace(
+            audit_id=f"{dataset}-{i}",
+            dataset_fingerprint=dataset,
+            previous_record_hash=previous,
+            record_hash=None,
+        )
+        record.record_hash = previous = compute_audit_hash(_to_plain(record))
+        records.append(record)
+    return records
+
+
+def _log_ids(container, dataset):
+    return [_loads(line)["audit_id"] for line in container.blobs[dataset + ".jsonl"].splitlines()]
+
+
+def test_tail_read_doubles_until_a_whole_line_is_in_view(container):
+    first, second = _chain("a", 2)
+    second.note = "x" * 100
+    second.record_hash = compute_audit_hash(_to_plain(second))
+    store = AuditStorage("conn", "audits")
+    store.commit_record(first)
+    store.commit_record(second)
+    store.TAIL_READ_BYTES = 16
+    container.downloads.clear()
+
+    last = store.get_last_audit("a")
+
+    assert last["audit_id"] == "a-1"
+    assert container.downloads[:4] == [16, 32, 64, 128]
+    assert store.get_last_audit("missing") is None
+
+
+def test_log_is_created_once_and_existing_logs_are_kept(container):
+    first, second, third = _chain("a", 3)
+    container.blobs["a.jsonl"] = bytearray(_dumps_line(_to_plain(first)))
+    store = AuditStorage("conn", "audits")
+
+    store.commit_record(second)
+    store.commit_record(third)
+
+    assert container.creates == 1
+    assert _log_ids(container, "a") == ["a-0", "a-1", "a-2"]
+    assert store.verify_chain("a") == 3
+
+
+def test_commit_record_rejects_broken_chain_and_bad_hash(container):
+    first, second = _chain("a", 2)
+    store = AuditStorage("conn", "audits")
+    store.commit_record(first)
+
+    second.previous_record_hash = "forged"
+    with pytest.raises(ValueError, match="chain broken"):
+        store.commit_record(second)
+
+    second.previous_record_hash = first.record_hash
+    second.audit_id = "tampered"
+    with pytest.raises(ValueError, match="hash mismatch"):
+        store.commit_record(second)
+
+    assert _log_ids(container, "a") == ["a-0"]
+
+
+def test_commit_record_fails_when_another_writer_appended_first(container):
+    first, second = _chain("a", 2)
+    store = AuditStorage("conn", "audits")
+    store.commit_record(first)
+
+    other = _dumps_line({"audit_id": "other", "record_hash": "h"})
+    container.before_append = lambda: container.blobs["a.jsonl"].extend(other)
+    with pytest.raises(ValueError, match="chain broken"):
+        store.commit_record(second)
+
+    assert _log_ids(container, "a") == ["a-0", "other"]
+
+
+def test_async_commits_keep_chain_order_under_gather(async_container):
+    chains = {dataset: _chain(dataset, 5) for dataset in ("a", "b")}
+
+    async def run():
+        async with AsyncAuditStorage("conn", "audits", flush_interval=0) as store:
+            await asyncio.gather(*(
+                store.commit_record(record) for records in chains.values() for record in records
+            ))
+            return await store.get_last_audit("a")
+
+    last = asyncio.run(run())
+
+    assert last["audit_id"] == "a-4"
+    for dataset, records in chains.items():
+        assert _log_ids(async_container, dataset) == [r.audit_id for r in records]
+        assert _verify_log_chunks([bytes(async_container.blobs[dataset + ".jsonl"])]) == 5
+
+
+def test_async_commit_rejects_broken_chain(async_container):
+    first, second = _chain("a", 2)
+    second.previous_record_hash = "forged"
+
+    async def run():
+        async with AsyncAuditStorage("conn", "audits", flush_interval=0) as store:
+            await store.commit_record(first)
+            with pytest.raises(ValueError, match="chain broken"):
+                await store.commit_record(second)
+
+    asyncio.run(run())
+
+    assert _log_ids(async_container, "a") == ["a-0"]
+
+
+def test_async_append_failure_voids_records_chained_behind_it(async_container):
+    records = _chain("a", 2)
+    async_container.failing_calls = {1}
+
+    async def run():
+        async with AsyncAuditStorage("conn", "audits", batch_size=1, flush_interval=0) as store:
+            results = await asyncio.gather(
+                *(store.commit_record(record) for record in records),
+                return_exceptions=True,
+            )
+            # The chain head is re-read from storage, so the lost records
+            # can be resubmitted
+            for record in records:
+                await store.commit_record(record)
+            return results
+
+    first, second = asyncio.run(run())
+
+    assert isinstance(first, IOError)
+    assert isinstance(second, ValueError)
+    assert _log_ids(async_container, "a") == ["a-0", "a-1"]
+
+
+def test_async_append_settles_each_block_when_it_lands(async_container):
+    records = _chain("a", 3)
+    # One record per block; the second block fails
+    async_container.failing_calls = {2}
+
+    async def run():
+        async with AsyncAuditStorage("conn", "audits", flush_interval=0) as store:
+            store.MAX_APPEND_BYTES = 1
+            results = await asyncio.gather(
+                *(store.commit_record(record) for record in records),
+                return_exceptions=True,
+            )
+            await store.commit_record(records[1])
+            return results
+
+    results = asyncio.run(run())
+
+    assert results[0] is None
+    assert all(isinstance(r, IOError) for r in results[1:])
+    assert _log_ids(async_container, "a") == ["a-0", "a-1"]
+
+
+def test_async_commit_fails_when_another_writer_appended_between_commits(async_container):
+    first, second, third = _chain("a", 3)
+
+    async def run():
+        async with AsyncAuditStorage("conn", "audits", flush_interval=0) as store:
+            await store.commit_record(first)
+            # Another process extends the log behind this instance's back
+            other = _dumps_line({"audit_id": "other", "record_hash": "h"})
+            async_container.blobs["a.jsonl"].extend(other)
+            with pytest.raises(ValueError, match="chain broken"):
+                await store.commit_record(second)
+            # The head is re-read, so the next record must chain to "other"
+            with pytest.raises(ValueError, match="chain broken"):
+                await store.commit_record(third)
+
+    asyncio.run(run())
+
+    assert _log_ids(async_container, "a") == ["a-0", "other"]
@@ -7,21 +7,26 @@ EXCLUDED_HASH_FIELDS = {
     "previous_record_hash",
 }
 
+# Canonical form: sorted keys, compact separators, ASCII-escaped. Stored
+# hashes depend on these exact bytes, so the encoder must not change (nor
+# vary with optional packages). Built once; json.dumps with non-default
+# options would construct a new encoder per call.
+_CANONICAL_ENCODER = json.JSONEncoder(
+    sort_keys=True,
+    separators=(",", ":"),
+)
+
 def compute_audit_hash(audit_payload: Dict[str, Any]) -> str:
     """
     Deterministically compute a SHA-256 hash over the audit record,
     excluding self-referential hash fields.
     """
     canonical_payload = {
-        k: audit_payload[k]
-        for k in sorted(audit_payload.keys())
+        k: v
+        for k, v in audit_payload.items()
         if k not in EXCLUDED_HASH_FIELDS
     }
 
-    serialized = json.dumps(
-        canonical_payload,
-        sort_keys=True,
-        separators=(",", ":")
-    )
+    serialized = _CANONICAL_ENCODER.encode(canonical_payload)
 
     return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
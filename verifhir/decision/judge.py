@@ -26,14 +26,8 @@ class DecisionEngine:
                 reason="No violations found."
             )
 
-        # 1. Score every violation
-        scored_violations = []
-        max_score = 0.0
-        
-        for v in violations:
-            score = calculate_risk_score(v)
-            max_score = max(max_score, score)
-            scored_violations.append((score, v))
+        # 1. Score every violation (only the maximum is kept)
+        max_score = max(0.0, max(map(calculate_risk_score, violations)))
 
         # 2. Determine Verdict
         if max_score >= self.BLOCK_THRESHOLD:
@@ -1,3 +1,5 @@
+import functools
+
 from verifhir.models.violation import Violation, ViolationSeverity
 
 # Risk Weights
@@ -7,16 +9,18 @@ SEVERITY_WEIGHTS = {
     ViolationSeverity.MINOR: 0.2     # Noise, warnings
 }
 
+@functools.lru_cache(maxsize=256)
+def _weighted_risk(severity: ViolationSeverity, confidence: float) -> float:
+    # Pure in (severity, confidence); rules always report 1.0, so the
+    # cache stays small and hot.
+    return round(SEVERITY_WEIGHTS.get(severity, 0.0) * confidence, 2)
+
 def calculate_risk_score(violation: Violation) -> float:
     """
     Calculates a single violation's risk score (0.0 to 1.0).
     Formula: Severity Weight * Confidence
     """
-    # 1. Get Base Severity Score
-    base_weight = SEVERITY_WEIGHTS.get(violation.severity, 0.0)
-    
-    # 2. Factor in Confidence (ML models might report 0.5, Rules report 1.0)
-    # This prevents low-confidence ML noise from blocking pipelines.
-    risk = base_weight * violation.confidence
-    
-    return round(risk, 2)
\ No newline at end of file
+    # Severity weight scaled by confidence (ML models might report 0.5,
+    # Rules report 1.0). This prevents low-confidence ML noise from
+    # blocking pipelines.
+    return _weighted_risk(violation.severity, violation.confidence)
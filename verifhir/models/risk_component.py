@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Optional
 from .violation import Violation
 
@@ -8,4 +9,11 @@ class RiskComponent:
     violation: Violation
     weight: float
     weighted_score: float
-    explanation: str
+
+    @cached_property
+    def explanation(self) -> str:
+        # Built on first access only; aggregation reads weighted_score alone.
+        return (
+            f"{self.violation.regulation} violation "
+            f"({self.violation.citation}) at {self.violation.field_path}"
+        )
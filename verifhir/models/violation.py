@@ -9,7 +9,8 @@ class ViolationSeverity(str, Enum):
     MINOR = "MINOR"
 
 
-@dataclass(frozen=True)
+# slots=True: no per-instance __dict__; rules emit many of these per Bundle.
+@dataclass(frozen=True, slots=True)
 class Violation:
     violation_type: str
     severity: ViolationSeverity
@@ -1,5 +1,8 @@
+import functools
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from typing import Dict, List, Any, Optional
 
 # --- CRITICAL MODEL IMPORTS ---
@@ -7,6 +10,7 @@ from verifhir.models.violation import Violation, ViolationSeverity
 # --- CONTROL IMPORTS (Day 19) ---
 from verifhir.controls.allow_list import is_allowlisted
 from verifhir.controls.false_positives import is_false_positive
+from verifhir.rules.utils.identifier_patterns import IdentifierPreScan, scan_note_batch
 
 # --- DYNAMIC IMPORTS ---
 try:
@@ -20,7 +24,7 @@ except ImportError:
     DPDPDataPrincipalRule = None
 
 try:
-    from verifhir.rules.gdpr import GDPRFreeTextIdentifierRule
+    from verifhir.rules.gdpr_free_text_identifier_rule import GDPRFreeTextIdentifierRule
 except ImportError:
     GDPRFreeTextIdentifierRule = None
 
@@ -39,18 +43,131 @@ try:
 except ImportError:
     LGPDFreeTextRule = None
 
+# --- RULE REGISTRY ---
+# Regulation code -> rule class, in execution order. Rules whose import
+# failed are left out.
+_RULE_REGISTRY = {
+    code: rule_cls
+    for code, rule_cls in (
+        ("HIPAA", HIPAAIdentifierRule),
+        ("DPDP", DPDPDataPrincipalRule),
+        ("GDPR", GDPRFreeTextIdentifierRule),
+        ("UK_GDPR", UKGDPRFreeTextRule),
+        ("PIPEDA", PIPEDAFreeTextRule),
+        ("LGPD", LGPDFreeTextRule),
+    )
+    if rule_cls is not None
+}
+
+# Regulation code -> (citation substrings, governing codes, subject countries).
+# A rule is selected when any one of them matches.
+_RULE_TRIGGERS = {
+    "HIPAA": (("HIPAA",), (), ()),
+    "DPDP": (("DPDP",), (), ()),
+    "GDPR": (("GDPR",), (), ()),
+    "UK_GDPR": (("UK_GDPR",), ("UK_GDPR",), ("GB",)),
+    "PIPEDA": (("PIPEDA",), ("PIPEDA",), ("CA",)),
+    "LGPD": (("LGPD",), (), ()),
+}
+
+# Governing regulation that suppresses a rule even when it is triggered
+# (a UK_GDPR citation also contains "GDPR").
+_RULE_EXCLUSIONS = {
+    "GDPR": "UK_GDPR",
+}
+
+
+# Every citation substring the engine branches on.
+_CITATION_TOKENS = ("HIPAA", "DPDP", "GDPR", "UK_GDPR", "UK DATA", "PIPEDA", "LGPD")
+
+
+@functools.lru_cache(maxsize=256)
+def _citation_tokens(citation: str) -> frozenset:
+    """
+    The _CITATION_TOKENS found in an (upper-cased) citation. Policies reuse a
+    handful of citation strings, so each is scanned once per process.
+    """
+    return frozenset(token for token in _CITATION_TOKENS if token in citation)
+
+
+@functools.lru_cache(maxsize=256)
+def _select_regulation_codes(citation: Any, reg_code: Any, subject_country: Any) -> tuple:
+    """
+    Regulation codes whose rules should run, in _RULE_TRIGGERS order.
+    """
+    cited = _citation_tokens(citation)
+    return tuple(
+        code
+        for code, (cite_tokens, gov_codes, countries) in _RULE_TRIGGERS.items()
+        if _RULE_EXCLUSIONS.get(code) != reg_code
+        and (
+            reg_code in gov_codes
+            or subject_country in countries
+            or not cited.isdisjoint(cite_tokens)
+        )
+    )
+
+
+# Regulations that apply whenever the data subject resides in the country,
+# even if the resolver did not list them.
+_COUNTRY_IMPLIED_REGULATIONS = {
+    "CA": "PIPEDA",
+    "GB": "UK_GDPR",
+}
+_MISSING = object()
+
+# Fields shared by every violation the engine raises itself.
+_deterministic_violation = functools.partial(
+    Violation,
+    field_path="note.text",
+    detection_method="DeterministicRule",
+    confidence=1.0,
+)
+
+# --- SAFETY-NET PATTERN (resolved once, not per evaluate call) ---
+_PATIENT_ID_RE = re.compile(r"Patient ID\s+(\d+)", re.IGNORECASE)
+
+try:
+    from verifhir.remediation import patterns as shared_patterns
+    _SAFETY_NET_ID_RE = shared_patterns.PATTERNS.get("MRN")
+except Exception:
+    _SAFETY_NET_ID_RE = _PATIENT_ID_RE
+
 
 class DeterministicRuleEngine:
     """
     The Core Rule Engine.
     Consolidated Logic (Day 20 Version).
     """
-    def __init__(self):
+    def __init__(self, max_workers: int = 1):
         self.logger = logging.getLogger("verifhir.orchestrator")
+        # Sequential by default: the shared scans run on the caller thread
+        # (prescan.warm()) and the remaining rule work is pure Python under
+        # the GIL, so a pool adds hand-off cost without overlap. max_workers
+        # > 1 only helps rules that block on I/O.
+        self._pool = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+
+    def __enter__(self) -> "DeterministicRuleEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shuts down the rule thread pool, if any. The engine keeps working
+        afterwards, evaluating rules sequentially.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
 
-    def evaluate(self, resource: Dict[str, Any], policy: Any) -> List[Violation]:
-        raw_violations = []
-        
+    def evaluate(
+        self,
+        resource: Dict[str, Any],
+        policy: Any,
+        prescan: Optional[IdentifierPreScan] = None,
+    ) -> List[Violation]:
         # --- 1. RESOLVE METADATA & CONTEXT ---
         citation = getattr(policy, "regulation_citation", "Unknown")
         reg_code = getattr(policy, "governing_regulation", "Unknown") or "Unknown"
@@ -71,60 +188,59 @@ class DeterministicRuleEngine:
             }
             citation = citation_map.get(reg_code, citation)
 
-        # Context Extraction
+        # Context Extraction (each attribute is read once into a local)
         subject_country = None
-        if hasattr(policy, "context") and policy.context:
-            subject_country = getattr(policy.context, "data_subject_country", None)
-            
-            if hasattr(policy.context, "applicable_regulations"):
-                current_regs = policy.context.applicable_regulations or []
-                applicable_regs = set(current_regs)
-                if subject_country == "CA" and "PIPEDA" not in applicable_regs:
-                    applicable_regs.add("PIPEDA")
-                if subject_country == "GB" and "UK_GDPR" not in applicable_regs:
-                    applicable_regs.add("UK_GDPR")
-                policy.context.applicable_regulations = list(applicable_regs)
+        ctx = getattr(policy, "context", None)
+        if ctx:
+            subject_country = getattr(ctx, "data_subject_country", None)
+
+            current_regs = getattr(ctx, "applicable_regulations", _MISSING)
+            if current_regs is not _MISSING:
+                implied_reg = _COUNTRY_IMPLIED_REGULATIONS.get(subject_country)
+                # Only rewrite the caller's context when a regulation is added
+                if implied_reg and implied_reg not in (current_regs or ()):
+                    ctx.applicable_regulations = list(set(current_regs or ()) | {implied_reg})
 
         # --- 2. EXECUTE RULES ---
-        if "HIPAA" in citation and HIPAAIdentifierRule:
-            raw_violations.extend(self._safe_run(HIPAAIdentifierRule(policy), resource))
-        if "DPDP" in citation and DPDPDataPrincipalRule:
-            raw_violations.extend(self._safe_run(DPDPDataPrincipalRule(policy), resource))
-        if "GDPR" in citation and reg_code != "UK_GDPR" and GDPRFreeTextIdentifierRule:
-             raw_violations.extend(self._safe_run(GDPRFreeTextIdentifierRule(policy), resource))
-        if ("UK_GDPR" in citation or "UK Data" in citation or reg_code == "UK_GDPR" or subject_country == "GB") and UKGDPRFreeTextRule:
-             raw_violations.extend(self._safe_run(UKGDPRFreeTextRule(policy), resource))
-        if ("PIPEDA" in citation or reg_code == "PIPEDA" or subject_country == "CA") and PIPEDAFreeTextRule:
-             raw_violations.extend(self._safe_run(PIPEDAFreeTextRule(policy), resource))
-        if "LGPD" in citation and LGPDFreeTextRule:
-             raw_violations.extend(self._safe_run(LGPDFreeTextRule(policy), resource))
+        # Resource text is scanned at most once, however many rules consult it
+        if prescan is None:
+            prescan = IdentifierPreScan(resource)
+        rules_to_run = [
+            _RULE_REGISTRY[code](policy)
+            for code in _select_regulation_codes(citation, reg_code, subject_country)
+            if code in _RULE_REGISTRY
+        ]
+
+        raw_violations = list(
+            chain.from_iterable(self._run_rules(rules_to_run, resource, prescan))
+        )
 
         # --- 3. SAFETY NET FALLBACKS ---
         if not raw_violations:
-            resource_str = str(resource)
+            cited = _citation_tokens(citation)
+            # PII-bearing fields only, shared with the rules via the prescan
+            pii_texts = prescan.pii_texts
             # Use shared MRN/ID pattern rather than naive literal search
-            try:
-                from verifhir.remediation import patterns as shared_patterns
-                mrn_pat = shared_patterns.PATTERNS.get("MRN")
-            except Exception:
-                mrn_pat = re.compile(r"Patient ID\s+(\d+)", re.IGNORECASE)
+            mrn_pat = _SAFETY_NET_ID_RE
 
             found_id = None
             if mrn_pat:
-                m = mrn_pat.search(resource_str)
-                if m:
-                    found_id = m.group(0)
+                for text in pii_texts:
+                    m = mrn_pat.search(text)
+                    if m:
+                        found_id = m.group(0)
+                        break
 
-            if reg_code == "UK_GDPR" or "UK DATA" in citation or subject_country == "GB":
+            if reg_code == "UK_GDPR" or "UK DATA" in cited or subject_country == "GB":
                 if found_id:
                     raw_violations.append(self._make_violation("UK_NHS_NUMBER", "UK_GDPR", "UK Data Protection Act 2018 / UK GDPR Article 5", f"UK NHS Number / Patient ID detected: {found_id}", rule_id="UK_NHS_FALLBACK", span=str(found_id)))
-            elif reg_code == "PIPEDA" or "PIPEDA" in citation or subject_country == "CA":
+            elif reg_code == "PIPEDA" or "PIPEDA" in cited or subject_country == "CA":
                 consent_status = resource.get("meta", {}).get("consent_status")
                 if consent_status != "obtained" and found_id:
                     raw_violations.append(self._make_violation("UNCONSENTED_IDENTIFIER", "PIPEDA", citation, "Personal Information detected under PIPEDA", rule_id="PIPEDA_FALLBACK", span=str(found_id)))
             elif reg_code == "GDPR" and found_id:
                 raw_violations.append(self._make_violation("GDPR_IDENTIFIER", "GDPR", citation, "Personal Identifier detected under GDPR", rule_id="GDPR_FALLBACK", span=str(found_id)))
-            elif (reg_code == "DPDP" or "DPDP" in citation) and resource.get("resourceType") == "Patient":
+            elif (reg_code == "DPDP" or "DPDP" in cited) and resource.get("resourceType") == "Patient":
                 # Pass severity explicitly instead of mutating later
                 v = self._make_violation(
                     type="DPDP_CONSENT_MISSING",
@@ -154,23 +270,69 @@ class DeterministicRuleEngine:
 
         return clean_violations
 
-    def _safe_run(self, rule_instance, resource):
+    def evaluate_batch(
+        self, resources: List[Dict[str, Any]], policy: Any
+    ) -> List[List[Violation]]:
+        """
+        Evaluates many resources (e.g. Bundle entries) under one policy.
+        The free-text identifier scan runs over all their notes at once;
+        each resource is then evaluated exactly as evaluate() would.
+        """
+        texts: List[str] = []
+        spans = []  # (first note index, note count) per resource, or None
+        for resource in resources:
+            try:
+                notes = resource.get("note") or []
+                note_texts = [note.get("text", "") for note in notes]
+            except Exception:
+                # Malformed resource: let evaluate() fail the usual way
+                spans.append(None)
+                continue
+            spans.append((len(texts), len(note_texts)))
+            texts.extend(t if isinstance(t, str) else "" for t in note_texts)
+
+        flags = scan_note_batch(texts)
+
+        results = []
+        for resource, span in zip(resources, spans):
+            note_hits = None if span is None else flags[span[0]:span[0] + span[1]]
+            prescan = IdentifierPreScan(resource, note_hits=note_hits)
+            results.append(self.evaluate(resource, policy, prescan=prescan))
+        return results
+
+    def _run_rules(self, rules, resource, prescan):
+        """
+        Yields each rule's violations in rule order, so downstream
+        deduplication stays deterministic whichever thread finishes first.
+        """
+        # The one scope check: out-of-scope rules cost an attribute load
+        rules = [rule for rule in rules if rule._active]
+        if self._pool is None or len(rules) <= 1:
+            return (self._safe_iter(rule, resource, prescan) for rule in rules)
+
+        # Fill the shared scans up front so worker threads only read them
+        prescan.warm()
+        futures = [
+            self._pool.submit(list, self._safe_iter(rule, resource, prescan))
+            for rule in rules
+        ]
+        return (future.result() for future in futures)
+
+    def _safe_iter(self, rule_instance, resource, prescan=None):
         try:
-            return rule_instance.evaluate(resource)
+            violations = rule_instance.evaluate(resource, prescan)
         except Exception as e:
             self.logger.warning(f"Rule Execution Failed: {e}")
-            return []
+            return
+        yield from violations
 
     def _make_violation(self, type, reg, cite, msg, severity=ViolationSeverity.MAJOR, rule_id: Optional[str]=None, span: Optional[str]=None):
-        return Violation(
+        return _deterministic_violation(
             violation_type=type,
             severity=severity,
             regulation=reg,
             citation=cite,
-            field_path="note.text",
             description=msg,
-            detection_method="DeterministicRule",
-            confidence=1.0,
             span=span,
             rule_id=rule_id
         )
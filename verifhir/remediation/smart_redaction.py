@@ -6,45 +6,46 @@ while ensuring compliance. The output is advisory only and never auto-applies ch
 """
 
 import os
+import re
 import json
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
-from dotenv import load_dotenv
-from openai import AzureOpenAI
+import hashlib
+import functools
+import tempfile
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from datetime import datetime
 
-load_dotenv()
-
 logger = logging.getLogger("verifhir.remediation.smart_redaction")
 
+# Paragraphs without a digit, an e-mail marker or a capitalized word (a
+# possible name, even a lone "John") are not worth paying model prefill
+# for; the deterministic fallback still runs over them.
+_CANDIDATE_RE = re.compile(r"\d|@|[A-Z][a-z]")
+_PARAGRAPH_SEP = "\n\n"
+# Below this size the whole note is sent so the model keeps full context.
+_CHUNKING_MIN_CHARS = 4000
 
-def suggest_smart_redaction(text: str, violations: List[Any], regulation: str) -> Dict[str, Any]:
-    api_key = os.getenv("AZURE_OPENAI_KEY")
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o")
-    
-    client = None
-    if api_key and endpoint:
-        try:
-            client = AzureOpenAI(
-                api_key=api_key,
-                api_version="2024-02-15-preview",
-                azure_endpoint=endpoint
-            )
-        except Exception as e:
-            logger.error(f"Azure OpenAI client initialization failed: {e}")
-    
-    if not client:
-        logger.warning("Azure OpenAI unavailable, using fallback redaction")
-        return _fallback_redaction(text, regulation)
-    
-    try:
-        # Updated system prompt with explicit generalization demand for non-HIPAA regs
-        system_prompt = f"""You are a clinical documentation assistant providing NON-AUTHORITATIVE redaction suggestions.
+_API_VERSION = "2024-02-15-preview"
+
+# Token budget (gpt-4o context window). Prompts that cannot fit with room for
+# a useful answer go straight to the deterministic fallback.
+_MODEL_CONTEXT_TOKENS = 128_000
+_MAX_PROMPT_TOKENS = 100_000
+_MAX_COMPLETION_TOKENS = 2000
+_TOKEN_SAFETY_MARGIN = 256
+_MIN_COMPLETION_TOKENS = 256
+# Source of tiktoken's o200k_base table; names its local cache file.
+_TIKTOKEN_BPE_URL = "https://openaipublic.blob.core.windows.net/encodings/o200k_base.tiktoken"
+
+# Explicit generalization demand for non-HIPAA regs
+_SYSTEM_PROMPT = """You are a clinical documentation assistant providing NON-AUTHORITATIVE redaction suggestions.
 
 CORE RULES:
 - Remove all direct identifiers.
 - Preserve clinical utility and temporal relationships.
+- Keep every blank-line paragraph break exactly as in the input; never merge
+  or split paragraphs.
 - For GDPR, LGPD, UK_GDPR, DPDP, and BASE regulations: 
   When handling Tier 2 or Tier 3 dates, ALWAYS generalize to Year only or Month/Year 
   (e.g., "April 2024" instead of "18/04/2024") rather than full redaction.
@@ -55,67 +56,355 @@ TEMPORAL HANDLING:
 - Tier 3 → Relative expression (e.g., "X months prior to admission") or generalized Month/Year
 
 Output format (strict JSON):
-{{
+{
     "redacted": "...",
     "reasoning": "...",
     "preserved": ["list of preserved clinical elements"]
-}}"""
+}"""
+
+
+@functools.cache
+def _load_env() -> None:
+    # dotenv is only needed once smart redaction is actually used
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def _credentials():
+    _load_env()
+    api_key = os.getenv("AZURE_OPENAI_KEY")
+    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
+    if not (api_key and endpoint):
+        return None
+    return api_key, endpoint
+
+
+@functools.lru_cache(maxsize=None)
+def _build_client(api_key: str, endpoint: str):
+    # Deferred so importing this module does not pull in openai/httpx/pydantic
+    from openai import AzureOpenAI
+    return AzureOpenAI(
+        api_key=api_key,
+        api_version=_API_VERSION,
+        azure_endpoint=endpoint
+    )
+
+
+def _build_async_client(api_key: str, endpoint: str):
+    # Not cached: the httpx pool is bound to the loop it first runs on, so
+    # each caller owns its client and closes it (async with) when done.
+    from openai import AsyncAzureOpenAI
+    return AsyncAzureOpenAI(
+        api_key=api_key,
+        api_version=_API_VERSION,
+        azure_endpoint=endpoint
+    )
+
+
+def _get_client():
+    """
+    Returns a cached AzureOpenAI client, or None when credentials are missing
+    or the client cannot be created.
+    """
+    creds = _credentials()
+    if not creds:
+        return None
+    try:
+        return _build_client(*creds)
+    except Exception as e:
+        logger.error(f"Azure OpenAI client initialization failed: {e}")
+        return None
+
+
+def _get_async_client():
+    """
+    A new AsyncAzureOpenAI client for the caller to close, or None when
+    credentials are missing or the client cannot be created.
+    """
+    creds = _credentials()
+    if not creds:
+        return None
+    try:
+        return _build_async_client(*creds)
+    except Exception as e:
+        logger.error(f"Azure OpenAI async client initialization failed: {e}")
+        return None
+
+
+def _tiktoken_cache_path() -> Optional[str]:
+    # Where tiktoken keeps the downloaded o200k_base table (mirrors
+    # tiktoken.load.read_file_cached); None when its cache is disabled.
+    if "TIKTOKEN_CACHE_DIR" in os.environ:
+        cache_dir = os.environ["TIKTOKEN_CACHE_DIR"]
+    elif "DATA_GYM_CACHE_DIR" in os.environ:
+        cache_dir = os.environ["DATA_GYM_CACHE_DIR"]
+    else:
+        cache_dir = os.path.join(tempfile.gettempdir(), "data-gym-cache")
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir, hashlib.sha1(_TIKTOKEN_BPE_URL.encode()).hexdigest())
+
+
+@functools.cache
+def _get_encoding():
+    """
+    The gpt-4o (o200k_base) encoding, or None to use the len // 4 estimate.
+
+    tiktoken downloads its BPE table on first use. That download is never
+    triggered from here: the encoding is only loaded when the table is
+    already in tiktoken's cache (TIKTOKEN_CACHE_DIR, default
+    <tmp>/data-gym-cache). To enable exact counts, warm the cache once with
+    network access, e.g. python -c "import tiktoken; tiktoken.get_encoding('o200k_base')".
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    cache_path = _tiktoken_cache_path()
+    if cache_path is None or not os.path.exists(cache_path):
+        logger.info("tiktoken BPE table not cached locally; estimating prompt tokens")
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken encoding unavailable: {e}")
+        return None
+
+
+def _count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is None:
+        # Rough English average when tiktoken is not installed
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
+
+
+@functools.cache
+def _system_prompt_tokens() -> int:
+    # Constant prompt: counted once, not on every request
+    return _count_tokens(_SYSTEM_PROMPT)
+
+
+def _select_candidate_chunks(text: str):
+    """
+    Splits text into paragraphs and returns (chunks, indices to send).
+    Short texts are sent whole; long texts only send paragraphs that may
+    still hold identifiers. An empty index list means nothing to send.
+    """
+    chunks = text.split(_PARAGRAPH_SEP)
+    candidates = [i for i, chunk in enumerate(chunks) if _CANDIDATE_RE.search(chunk)]
+    if candidates and len(text) < _CHUNKING_MIN_CHARS:
+        candidates = list(range(len(chunks)))
+    return chunks, candidates
 
-        violations_summary = "".join([f"- {getattr(v, 'violation_type', str(v))}: {getattr(v, 'description', '')}\n" for v in violations]) if violations else "None"
 
-        user_prompt = f"""Redact the following clinical text while preserving clinical utility:
+def _stitch_chunks(chunks: List[str], candidates: List[int], redacted: str) -> Optional[str]:
+    """
+    Puts redacted candidate paragraphs back in place by index.
+    Returns None if the model did not preserve the paragraph structure.
+    """
+    if len(candidates) == len(chunks):
+        return redacted
+    parts = redacted.split(_PARAGRAPH_SEP)
+    if len(parts) != len(candidates):
+        return None
+    stitched = list(chunks)
+    for i, part in zip(candidates, parts):
+        stitched[i] = part
+    return _PARAGRAPH_SEP.join(stitched)
 
-{text}
+
+def _redact_skipped_chunks(chunks: List[str], candidates: List[int], regulation: str) -> List[str]:
+    """
+    Runs the deterministic fallback over the paragraphs that were not sent
+    to the model, so nothing is stitched back unredacted.
+    """
+    if len(candidates) == len(chunks):
+        return chunks
+    sent = set(candidates)
+    return [
+        chunk if i in sent or not chunk.strip() else _fallback_redaction(chunk, regulation)["redacted_text"]
+        for i, chunk in enumerate(chunks)
+    ]
+
+
+def _completion_params(prompt_text: str, violations: List[Any]) -> Optional[Dict[str, Any]]:
+    """
+    Chat completion arguments shared by the sync and async entry points.
+    Returns None when the prompt is too large for the call to be worthwhile.
+    """
+    violations_summary = "".join([f"- {getattr(v, 'violation_type', str(v))}: {getattr(v, 'description', '')}\n" for v in violations]) if violations else "None"
+
+    user_prompt = f"""Redact the following clinical text while preserving clinical utility:
+
+{prompt_text}
 
 Detected violations:
 {violations_summary}
 
 Return only valid JSON."""
 
-        response = client.chat.completions.create(
-            model=deployment,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.0,
-            max_tokens=2000,
-            response_format={"type": "json_object"}
-        )
-        
-        raw_response = response.choices[0].message.content.strip()
+    prompt_tokens = _system_prompt_tokens() + _count_tokens(user_prompt)
+    max_tokens = min(
+        _MAX_COMPLETION_TOKENS,
+        _MODEL_CONTEXT_TOKENS - prompt_tokens - _TOKEN_SAFETY_MARGIN,
+    )
+    if prompt_tokens > _MAX_PROMPT_TOKENS or max_tokens < _MIN_COMPLETION_TOKENS:
+        return None
+
+    return {
+        "model": os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o"),
+        "messages": [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ],
+        "temperature": 0.0,
+        "max_tokens": max_tokens,
+        "response_format": {"type": "json_object"},
+    }
+
 
-        def _parse_strict_json(s: str):
+def _parse_strict_json(s: str):
+    try:
+        return json.loads(s)
+    except json.JSONDecodeError:
+        m = re.search(r"\{.*\}", s, re.S)
+        if m:
             try:
-                return json.loads(s)
-            except json.JSONDecodeError:
-                import re as _re
-                m = _re.search(r"\{.*\}", s, _re.S)
-                if m:
-                    try:
-                        return json.loads(m.group(0))
-                    except:
-                        return None
+                return json.loads(m.group(0))
+            except:
                 return None
+        return None
+
+
+def _build_result(
+    text: str,
+    regulation: str,
+    chunks: List[str],
+    candidates: List[int],
+    raw_response: str,
+) -> Dict[str, Any]:
+    result = _parse_strict_json(raw_response)
+
+    # Retry logic
+    if result is None:
+        logger.warning("Smart redaction: JSON parse failed — retrying")
+        # ... (retry code unchanged)
+
+    # Only fall back if AI completely fails to return valid redacted text
+    if not result or not isinstance(result, dict) or "redacted" not in result or not result.get("redacted", "").strip():
+        logger.warning("Smart redaction failed completely — using deterministic fallback")
+        return _fallback_redaction(text, regulation)
+
+    redacted_text = _stitch_chunks(
+        _redact_skipped_chunks(chunks, candidates, regulation), candidates, result["redacted"]
+    )
+    if redacted_text is None:
+        logger.warning("Smart redaction: paragraph structure changed — using deterministic fallback")
+        return _fallback_redaction(text, regulation)
+
+    return {
+        "redacted_text": redacted_text,
+        "reasoning": result.get("reasoning", "AI-generated suggestion"),
+        "preserved_elements": result.get("preserved", [])
+    }
+
 
-        result = _parse_strict_json(raw_response)
-        
-        # Retry logic
-        if result is None:
-            logger.warning("Smart redaction: JSON parse failed — retrying")
-            # ... (retry code unchanged)
+def suggest_smart_redaction(text: str, violations: List[Any], regulation: str) -> Dict[str, Any]:
+    chunks, candidates = _select_candidate_chunks(text)
+    if not candidates:
+        # Nothing identifier-like left: skip the API call entirely
+        return _fallback_redaction(text, regulation)
+
+    client = _get_client()
+    if not client:
+        logger.warning("Azure OpenAI unavailable, using fallback redaction")
+        return _fallback_redaction(text, regulation)
+
+    prompt_text = _PARAGRAPH_SEP.join(chunks[i] for i in candidates)
+    params = _completion_params(prompt_text, violations)
+    if params is None:
+        logger.warning("Smart redaction: prompt exceeds token budget — using deterministic fallback")
+        return _fallback_redaction(text, regulation)
+
+    try:
+        response = client.chat.completions.create(**params)
+        raw_response = response.choices[0].message.content.strip()
+        return _build_result(text, regulation, chunks, candidates, raw_response)
 
-        # Only fall back if AI completely fails to return valid redacted text
-        if not result or not isinstance(result, dict) or "redacted" not in result or not result.get("redacted", "").strip():
-            logger.warning("Smart redaction failed completely — using deterministic fallback")
+    except Exception as e:
+        logger.error(f"Azure OpenAI redaction failed: {e}")
+        return _fallback_redaction(text, regulation)
+
+
+async def suggest_smart_redaction_async(text: str, violations: List[Any], regulation: str) -> Dict[str, Any]:
+    """
+    Non-blocking variant of suggest_smart_redaction() using AsyncAzureOpenAI.
+    Same fallbacks and output shape.
+    """
+    chunks, candidates = _select_candidate_chunks(text)
+    if not candidates:
+        return _fallback_redaction(text, regulation)
+
+    client = _get_async_client()
+    if not client:
+        logger.warning("Azure OpenAI unavailable, using fallback redaction")
+        return _fallback_redaction(text, regulation)
+
+    async with client:
+        return await _complete_async(client, text, violations, regulation, chunks, candidates)
+
+
+async def suggest_smart_redaction_many(
+    items: Iterable[Tuple[str, List[Any], str]],
+    concurrency: int = 8,
+) -> List[Dict[str, Any]]:
+    """
+    Runs suggest_smart_redaction_async() over (text, violations, regulation)
+    items with at most `concurrency` requests in flight, sharing one client
+    that is closed before returning.
+    Results are returned in input order.
+    """
+    items = list(items)
+    client = _get_async_client()
+    if not client:
+        logger.warning("Azure OpenAI unavailable, using fallback redaction")
+        return [_fallback_redaction(text, regulation) for text, _, regulation in items]
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _bounded(text: str, violations: List[Any], regulation: str) -> Dict[str, Any]:
+        chunks, candidates = _select_candidate_chunks(text)
+        if not candidates:
             return _fallback_redaction(text, regulation)
+        async with semaphore:
+            return await _complete_async(client, text, violations, regulation, chunks, candidates)
+
+    async with client:
+        return await asyncio.gather(
+            *[_bounded(text, violations, regulation) for text, violations, regulation in items]
+        )
+
+
+async def _complete_async(
+    client,
+    text: str,
+    violations: List[Any],
+    regulation: str,
+    chunks: List[str],
+    candidates: List[int],
+) -> Dict[str, Any]:
+    prompt_text = _PARAGRAPH_SEP.join(chunks[i] for i in candidates)
+    params = _completion_params(prompt_text, violations)
+    if params is None:
+        logger.warning("Smart redaction: prompt exceeds token budget — using deterministic fallback")
+        return _fallback_redaction(text, regulation)
+
+    try:
+        response = await client.chat.completions.create(**params)
+        raw_response = response.choices[0].message.content.strip()
+        return _build_result(text, regulation, chunks, candidates, raw_response)
 
-        return {
-            "redacted_text": result.get("redacted", text),
-            "reasoning": result.get("reasoning", "AI-generated suggestion"),
-            "preserved_elements": result.get("preserved", [])
-        }
-            
     except Exception as e:
         logger.error(f"Azure OpenAI redaction failed: {e}")
         return _fallback_redaction(text, regulation)
@@ -6,18 +6,13 @@ from verifhir.risk.severity import severity_to_weight
 def build_risk_component(violation: Violation) -> RiskComponent:
     """
     Convert a Violation into a deterministic RiskComponent.
+    The explanation string is formatted lazily on RiskComponent.
     """
     weight = severity_to_weight(violation.severity)
     weighted_score = weight  # no aggregation yet
 
-    explanation = (
-        f"{violation.regulation} violation "
-        f"({violation.citation}) at {violation.field_path}"
-    )
-
     return RiskComponent(
         violation=violation,
         weight=weight,
         weighted_score=weighted_score,
-        explanation=explanation
     )
@@ -12,7 +12,8 @@ def severity_to_weight(severity: ViolationSeverity) -> float:
     """
     Convert a violation severity to a deterministic numeric weight.
     """
-    if severity not in SEVERITY_WEIGHTS:
+    weight = SEVERITY_WEIGHTS.get(severity)
+    if weight is None:
         raise ValueError(f"Unknown severity: {severity}")
 
-    return SEVERITY_WEIGHTS[severity]
+    return weight
@@ -1,9 +1,9 @@
 # verifhir/rules/base_free_text_identifier_rule.py
 
-from typing import List
+from typing import List, Optional
 from verifhir.rules.base_rule import ComplianceRule
 from verifhir.models.violation import Violation, ViolationSeverity
-from verifhir.rules.utils.identifier_patterns import IDENTIFIER_REGEX
+from verifhir.rules.utils.identifier_patterns import IdentifierPreScan
 
 
 class BaseFreeTextIdentifierRule(ComplianceRule):
@@ -15,34 +15,36 @@ class BaseFreeTextIdentifierRule(ComplianceRule):
     CITATION = None
     DESCRIPTION = None
 
-    def evaluate(self, resource: dict) -> List[Violation]:
-        if not all([self.REGULATION, self.CITATION, self.DESCRIPTION]):
-            raise NotImplementedError(
-                "Subclasses must define REGULATION, CITATION, and DESCRIPTION"
+    def __init_subclass__(cls, **kwargs):
+        # Configuration can only be wrong at class-definition time, so
+        # validate once on import instead of on every evaluate() call.
+        super().__init_subclass__(**kwargs)
+        if not all([cls.REGULATION, cls.CITATION, cls.DESCRIPTION]):
+            raise TypeError(
+                f"{cls.__name__} must define REGULATION, CITATION, and DESCRIPTION"
             )
-
-        # Context guard (unit tests may not provide one)
-        if self.context is not None:
-            if self.REGULATION not in self.context.applicable_regulations:
-                return []
-
-        violations: List[Violation] = []
-
-        notes = resource.get("note", [])
-        for note in notes:
-            text = note.get("text", "")
-            if IDENTIFIER_REGEX.search(text):
-                violations.append(
-                    Violation(
-                        violation_type="FREE_TEXT_IDENTIFIER",
-                        severity=ViolationSeverity.MAJOR,
-                        regulation=self.REGULATION,
-                        citation=self.CITATION,
-                        field_path="note[].text",
-                        description=self.DESCRIPTION,
-                        detection_method="rule-based",
-                        confidence=None,
-                    )
-                )
-
-        return violations
+        # Every hit yields the same violation; Violation is frozen, so one
+        # shared instance per subclass is safe to hand out.
+        cls._VIOLATION_TEMPLATE = Violation(
+            violation_type="FREE_TEXT_IDENTIFIER",
+            severity=ViolationSeverity.MAJOR,
+            regulation=cls.REGULATION,
+            citation=cls.CITATION,
+            field_path="note[].text",
+            description=cls.DESCRIPTION,
+            detection_method="rule-based",
+            confidence=None,
+        )
+
+    def evaluate(
+        self, resource: dict, prescan: Optional[IdentifierPreScan] = None
+    ) -> List[Violation]:
+        if not self._active:
+            return []
+
+        # The rule runner shares one prescan across all free-text rules;
+        # direct callers get a private one.
+        if prescan is None:
+            prescan = IdentifierPreScan(resource)
+
+        return [self._VIOLATION_TEMPLATE for hit in prescan.note_hits if hit]
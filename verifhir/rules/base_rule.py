@@ -1,7 +1,7 @@
 # verifhir/rules/base_rule.py
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 # IMPORTS MUST MATCH YOUR FILES:
 # 1. Import JurisdictionResolution from 'verifhir.jurisdiction.models'
@@ -10,10 +10,30 @@ from verifhir.jurisdiction.models import JurisdictionResolution
 # 2. Import Violation from 'verifhir.models.violation'
 from verifhir.models.violation import Violation
 
+if TYPE_CHECKING:
+    from verifhir.rules.utils.identifier_patterns import IdentifierPreScan
+
 class ComplianceRule(ABC):
+    # Regulation code enforced by the rule. When set, the rule is only active
+    # if the context lists it in applicable_regulations.
+    REGULATION: Optional[str] = None
+
     def __init__(self, context: Optional[JurisdictionResolution] = None):
         self.context = context
+        # Scope is fixed for the lifetime of the rule, so resolve it once
+        # (unit tests may not provide a context; a context may carry None).
+        self._active = (
+            context is None
+            or self.REGULATION is None
+            or self.REGULATION in (getattr(context, "applicable_regulations", None) or ())
+        )
 
     @abstractmethod
-    def evaluate(self, resource: dict) -> List[Violation]:
+    def evaluate(
+        self, resource: dict, prescan: Optional["IdentifierPreScan"] = None
+    ) -> List[Violation]:
+        """
+        prescan is the per-resource scan shared by the rule runner; rules
+        that scan text build their own when it is not supplied.
+        """
         pass
\ No newline at end of file
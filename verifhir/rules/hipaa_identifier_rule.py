@@ -1,21 +1,30 @@
-from typing import List
+from typing import List, Optional
 from verifhir.rules.base_rule import ComplianceRule
 from verifhir.models.violation import Violation, ViolationSeverity
+from verifhir.rules.utils.identifier_patterns import IdentifierPreScan
 
 class HIPAAIdentifierRule(ComplianceRule):
     """
     Enforces HIPAA Privacy Rule by looking for common US identifiers (like MRN).
     """
-    def evaluate(self, resource: dict) -> List[Violation]:
-        if "HIPAA" not in self.context.applicable_regulations:
+    REGULATION = "HIPAA"
+
+    def evaluate(self, resource: dict, prescan: Optional[IdentifierPreScan] = None) -> List[Violation]:
+        if not self._active:
+            return []
+
+        if prescan is None:
+            prescan = IdentifierPreScan(resource)
+
+        # One substring test on the shared joined text before any per-note walk
+        if "MRN" not in prescan.notes_text:
             return []
-        
+
         violations = []
-        notes = resource.get("note", [])
-        
+
         # Simple check for "MRN" label in text
-        for note in notes:
-            if "MRN" in note.get("text", ""):
+        for text in prescan.note_texts:
+            if "MRN" in text:
                  violations.append(Violation(
                     violation_type="HIPAA_IDENTIFIER",
                     severity=ViolationSeverity.MAJOR,
@@ -1,21 +1,23 @@
-from typing import List
-import re
+from typing import List, Optional
 from verifhir.rules.base_rule import ComplianceRule
 from verifhir.models.violation import Violation, ViolationSeverity
+from verifhir.rules.utils.identifier_patterns import IdentifierPreScan
 
 class PIPEDAFreeTextRule(ComplianceRule):
-    def evaluate(self, resource: dict) -> List[Violation]:
+    def evaluate(self, resource: dict, prescan: Optional[IdentifierPreScan] = None) -> List[Violation]:
         # 1. CONSENT CHECK (The critical logic)
         # If consent is obtained, strictly return NO violations.
         meta = resource.get("meta", {})
         if meta.get("consent_status") == "obtained":
             return [] 
 
+        if prescan is None:
+            prescan = IdentifierPreScan(resource)
+
         violations = []
-        text = str(resource)
-        
-        # 2. PII Check
-        if re.search(r"Patient ID\s+\d+", text):
+
+        # 2. PII Check (PII-bearing fields only, not the whole resource)
+        if "patient_id" in prescan.labels:
              violations.append(Violation(
                 violation_type="UNCONSENTED_IDENTIFIER",
                 severity=ViolationSeverity.MAJOR,
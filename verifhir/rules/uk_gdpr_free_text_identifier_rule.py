@@ -1,13 +1,15 @@
-from typing import List
-import re
+from typing import List, Optional
 from verifhir.rules.base_rule import ComplianceRule
 from verifhir.models.violation import Violation, ViolationSeverity
+from verifhir.rules.utils.identifier_patterns import IdentifierPreScan
 
 class UKGDPRFreeTextRule(ComplianceRule):
-    def evaluate(self, resource: dict) -> List[Violation]:
+    def evaluate(self, resource: dict, prescan: Optional[IdentifierPreScan] = None) -> List[Violation]:
+        if prescan is None:
+            prescan = IdentifierPreScan(resource)
+
         violations = []
-        text = str(resource)
-        if re.search(r"Patient ID\s+\d+", text):
+        if "patient_id" in prescan.labels:
              violations.append(Violation(
                 violation_type="UK_NHS_NUMBER",
                 severity=ViolationSeverity.MAJOR,
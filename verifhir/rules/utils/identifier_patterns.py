@@ -1,8 +1,254 @@
-import re
+import functools
+from bisect import bisect_right
+from typing import List, Optional, Set
+
+from verifhir.rules.utils.pii_fields import iter_pii_texts
+
+# Prefer the `regex` package (faster matcher, same syntax) and fall back to
+# the stdlib. re2 is not an option: COMBINED_IDENTIFIER_REGEX needs a lookahead.
+try:
+    import regex as _re  # type: ignore
+except ImportError:
+    import re as _re
+
+try:
+    import ahocorasick  # type: ignore  (pyahocorasick)
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None  # type: ignore
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import hyperscan  # type: ignore
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    hyperscan = None  # type: ignore
+    HYPERSCAN_AVAILABLE = False
+
+@functools.lru_cache(maxsize=None)
+def _compile(pattern: str, flags: int = 0):
+    """
+    Memoized compile for identifier patterns; rules adding new patterns
+    should go through here so each is compiled once per process.
+    """
+    return _re.compile(pattern, flags)
+
 
 # Centralized pattern for identifying common medical IDs.
 # Added 'cpf' for Brazil (LGPD) support.
-IDENTIFIER_REGEX = re.compile(
+IDENTIFIER_REGEX = _compile(
     r"(id|mrn|ssn|cpf)\s*[:#]?\s*[\d\.\-]+", # Updated to allow dots/dashes common in CPF
-    re.IGNORECASE
-)
\ No newline at end of file
+    _re.IGNORECASE
+)
+
+# Every jurisdictional identifier pattern in one alternation, so a resource
+# is scanned once no matter how many rules consult the result.
+#   mrn/cpf    - the two halves of IDENTIFIER_REGEX (case-insensitive)
+#   patient_id - the UK GDPR / PIPEDA "Patient ID <digits>" pattern. It is
+#                case-sensitive and sits in a lookahead so it does not
+#                consume the "ID <digits>" that the mrn branch also reports.
+COMBINED_IDENTIFIER_REGEX = _compile(
+    r"(?=(?P<patient_id>(?-i:Patient ID\s+\d+)))"
+    r"|(?P<mrn>(?:id|mrn|ssn)\s*[:#]?\s*[\d\.\-]+)"
+    r"|(?P<cpf>cpf\s*[:#]?\s*[\d\.\-]+)",
+    _re.IGNORECASE
+)
+_COMBINED_LABELS = tuple(COMBINED_IDENTIFIER_REGEX.groupindex)
+
+# Lower-cased literals at least one of which occurs in every ASCII match of
+# IDENTIFIER_REGEX and COMBINED_IDENTIFIER_REGEX ("Patient ID" contains "id").
+# ASCII text with none of them cannot match, so the regexes are skipped.
+# "id" also hits words like "did" or "provided", so prose rarely skips; the
+# gate stays because it costs a small fraction of a regex search when it
+# passes and spares the whole search when it does not (vitals, plans, ...).
+IDENTIFIER_KEYWORDS = ("id", "mrn", "ssn", "cpf")
+
+_KEYWORD_AUTOMATON = None
+if AHOCORASICK_AVAILABLE:
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in IDENTIFIER_KEYWORDS:
+        _KEYWORD_AUTOMATON.add_word(_keyword, _keyword)
+    _KEYWORD_AUTOMATON.make_automaton()
+
+# Joins note texts for a single scan. Neither \s nor the identifier
+# characters match it, so no hit can straddle two notes.
+NOTE_DELIMITER = "\u0001"
+
+_HYPERSCAN_DB = None
+if HYPERSCAN_AVAILABLE:
+    _HYPERSCAN_DB = hyperscan.Database()
+    _HYPERSCAN_DB.compile(
+        expressions=[IDENTIFIER_REGEX.pattern.encode("utf-8")],
+        ids=[0],
+        flags=[
+            hyperscan.HS_FLAG_CASELESS
+            | hyperscan.HS_FLAG_SINGLEMATCH
+            | hyperscan.HS_FLAG_UTF8
+            | hyperscan.HS_FLAG_UCP
+        ],
+    )
+
+
+def has_identifier_keyword(text: str) -> bool:
+    """
+    Cheap gate: True if any IDENTIFIER_KEYWORDS literal occurs in text.
+    One Aho-Corasick pass when pyahocorasick is installed.
+
+    Non-ASCII text always passes: the regexes match case-insensitively
+    under Unicode rules ("İD", "ſsn"), which str.lower() does not mirror.
+    """
+    if not text:
+        return False
+    if not text.isascii():
+        return True
+    lowered = text.lower()
+    if _KEYWORD_AUTOMATON is None:
+        return any(keyword in lowered for keyword in IDENTIFIER_KEYWORDS)
+    return next(_KEYWORD_AUTOMATON.iter(lowered), None) is not None
+
+
+def has_identifier(text: str) -> bool:
+    """
+    True if IDENTIFIER_REGEX matches anywhere in text.
+    Uses the Hyperscan database when installed, otherwise the compiled regex.
+    """
+    if not text:
+        return False
+    if _HYPERSCAN_DB is None:
+        return IDENTIFIER_REGEX.search(text) is not None
+
+    hits = []
+
+    def _on_match(*_args):
+        hits.append(True)
+        return True  # halt the scan on the first hit
+
+    try:
+        _HYPERSCAN_DB.scan(text.encode("utf-8"), match_event_handler=_on_match)
+    except hyperscan.ScanTerminated:
+        pass
+    return bool(hits)
+
+
+def scan_identifiers(text: str) -> Set[str]:
+    """
+    Returns the COMBINED_IDENTIFIER_REGEX group labels that match in text.
+    """
+    found: Set[str] = set()
+    if not text:
+        return found
+    for match in COMBINED_IDENTIFIER_REGEX.finditer(text):
+        found.add(match.lastgroup)
+        if len(found) == len(_COMBINED_LABELS):
+            break
+    return found
+
+
+def scan_note_batch(texts: List[str]) -> List[bool]:
+    """
+    IDENTIFIER_REGEX hit flag per text, from one finditer pass over all of
+    them joined with NOTE_DELIMITER. Match starts are mapped back to their
+    text through the cumulative offsets.
+    """
+    flags = [False] * len(texts)
+    if not texts:
+        return flags
+
+    blob = NOTE_DELIMITER.join(texts)
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + len(NOTE_DELIMITER)
+
+    for match in IDENTIFIER_REGEX.finditer(blob):
+        flags[bisect_right(starts, match.start()) - 1] = True
+    return flags
+
+
+class IdentifierPreScan:
+    """
+    Per-resource scratch for the deterministic rules: note texts, PII-bearing
+    texts and the identifier scans over them, each computed on first use.
+
+    Built once by the rule runner and shared by every rule evaluated against
+    the same resource, so R in-scope jurisdictions cost one walk and one scan
+    instead of R. Nothing is written back onto the resource itself.
+    """
+
+    def __init__(self, resource: dict, note_hits: Optional[List[bool]] = None):
+        # note_hits may be supplied by a batch scan (see scan_note_batch)
+        self._resource = resource
+        self._note_texts = None
+        self._notes_text = None
+        self._note_hits = note_hits
+        self._pii_texts = None
+        self._has_keywords = None
+        self._labels = None
+
+    @property
+    def pii_texts(self) -> list:
+        """iter_pii_texts(resource), materialised once."""
+        if self._pii_texts is None:
+            self._pii_texts = list(iter_pii_texts(self._resource))
+        return self._pii_texts
+
+    @property
+    def has_keywords(self) -> bool:
+        """
+        Keyword prefilter over all PII-bearing texts (notes included).
+        False means no identifier regex can match anywhere in the resource.
+        """
+        if self._has_keywords is None:
+            self._has_keywords = has_identifier_keyword(NOTE_DELIMITER.join(self.pii_texts))
+        return self._has_keywords
+
+    @property
+    def labels(self) -> Set[str]:
+        """scan_identifiers() over all PII-bearing texts, computed once."""
+        if self._labels is None:
+            if self.has_keywords:
+                self._labels = scan_identifiers(NOTE_DELIMITER.join(self.pii_texts))
+            else:
+                self._labels = set()
+        return self._labels
+
+    def warm(self) -> None:
+        """
+        Computes every cached scan now; used before sharing across threads.
+        Errors are left for the rules to hit (and report) themselves.
+        """
+        try:
+            self.labels
+            self.note_hits
+        except Exception:
+            pass
+
+    @property
+    def note_texts(self) -> list:
+        """note[].text for the resource, one string per note."""
+        if self._note_texts is None:
+            notes = self._resource.get("note")
+            self._note_texts = [note.get("text", "") for note in notes] if notes else []
+        return self._note_texts
+
+    @property
+    def notes_text(self) -> str:
+        """All note texts joined with NOTE_DELIMITER."""
+        if self._notes_text is None:
+            self._notes_text = NOTE_DELIMITER.join(self.note_texts)
+        return self._notes_text
+
+    @property
+    def note_hits(self) -> list:
+        """One bool per entry in resource["note"], computed on first access."""
+        if self._note_hits is None:
+            texts = self.note_texts
+            # One pass over all notes; per-note searches only on a hit.
+            if texts and self.has_keywords and has_identifier(self.notes_text):
+                self._note_hits = [
+                    IDENTIFIER_REGEX.search(text) is not None for text in texts
+                ]
+            else:
+                self._note_hits = [False] * len(texts)
+        return self._note_hits
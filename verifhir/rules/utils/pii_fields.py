@@ -0,0 +1,73 @@
+from typing import Any, Iterator
+
+# Free-text / identifier-bearing leaves inspected by the deterministic rules.
+# Everything else in a FHIR resource (codes, statuses, references, meta) is
+# skipped instead of being stringified and scanned.
+_LIST_FIELDS = (
+    ("note", "text"),
+    ("telecom", "value"),
+    ("extension", "valueString"),
+)
+# HumanName / Address parts: single strings and string lists
+_NAME_PARTS = ("text", "family", "given", "prefix", "suffix")
+_ADDRESS_PARTS = ("text", "line", "city", "district", "state", "postalCode")
+_OBJECT_FIELDS = (
+    ("subject", "display"),
+    ("code", "text"),
+    ("text", "div"),  # narrative; also where unstructured input is wrapped
+)
+
+
+def iter_pii_texts(resource: Any) -> Iterator[str]:
+    """
+    Yields the PII-bearing strings of a FHIR resource:
+    note[].text, telecom[].value, extension[].valueString, identifier[]
+    (as "system value", so labels such as "urn:mrn:..." stay next to the
+    value), name[] and address[] parts, subject.display, valueString,
+    code.text and text.div. Bundle entries and contained resources are
+    walked too.
+    """
+    if not isinstance(resource, dict):
+        return
+
+    for item in resource.get("identifier") or ():
+        if isinstance(item, dict):
+            parts = [item.get("system"), item.get("value")]
+            text = " ".join(p for p in parts if isinstance(p, str) and p)
+            if text:
+                yield text
+
+    for container, parts in (("name", _NAME_PARTS), ("address", _ADDRESS_PARTS)):
+        for item in resource.get(container) or ():
+            if isinstance(item, dict):
+                for key in parts:
+                    value = item.get(key)
+                    if isinstance(value, str) and value:
+                        yield value
+                    elif isinstance(value, list):
+                        yield from (v for v in value if isinstance(v, str) and v)
+
+    for container, key in _LIST_FIELDS:
+        for item in resource.get(container) or ():
+            if isinstance(item, dict):
+                value = item.get(key)
+                if isinstance(value, str) and value:
+                    yield value
+
+    for container, key in _OBJECT_FIELDS:
+        item = resource.get(container)
+        if isinstance(item, dict):
+            value = item.get(key)
+            if isinstance(value, str) and value:
+                yield value
+
+    value = resource.get("valueString")
+    if isinstance(value, str) and value:
+        yield value
+
+    for entry in resource.get("entry") or ():
+        if isinstance(entry, dict):
+            yield from iter_pii_texts(entry.get("resource"))
+
+    for contained in resource.get("contained") or ():
+        yield from iter_pii_texts(contained)
@@ -1,73 +1,291 @@
+import asyncio
+import functools
 import json
 import os
 import hashlib
-from typing import Optional, Dict, Any
+import pathlib
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
 from datetime import datetime
 
-try:
+if TYPE_CHECKING:
     from azure.storage.blob import BlobClient  # type: ignore
-    AZURE_AVAILABLE = True
+
+
+@functools.cache
+def _azure_blob_sdk() -> SimpleNamespace:
+    """
+    The Azure Blob SDK names AuditStorage needs, imported on first use so
+    importing this module (e.g. for the vault commit_record) stays cheap.
+    """
+    try:
+        from azure.core import MatchConditions  # type: ignore
+        from azure.core.exceptions import (  # type: ignore
+            ResourceExistsError,
+            ResourceModifiedError,
+            ResourceNotFoundError,
+        )
+        from azure.storage.blob import ContainerClient  # type: ignore
+    except ImportError as e:
+        raise ImportError(
+            "Azure Storage SDK is required for AuditStorage. "
+            "Install it with: pip install azure-storage-blob"
+        ) from e
+    return SimpleNamespace(
+        MatchConditions=MatchConditions,
+        ResourceExistsError=ResourceExistsError,
+        ResourceModifiedError=ResourceModifiedError,
+        ResourceNotFoundError=ResourceNotFoundError,
+        ContainerClient=ContainerClient,
+    )
+
+
+@functools.cache
+def _azure_blob_aio_sdk() -> SimpleNamespace:
+    """_azure_blob_sdk() with the asyncio ContainerClient."""
+    sdk = _azure_blob_sdk()
+    try:
+        from azure.storage.blob.aio import ContainerClient  # type: ignore
+    except ImportError as e:
+        raise ImportError(
+            "Azure Storage SDK (async) is required for AsyncAuditStorage. "
+            "Install it with: pip install azure-storage-blob aiohttp"
+        ) from e
+    return SimpleNamespace(**{**vars(sdk), "ContainerClient": ContainerClient})
+
+# Optional faster encoder; stdlib json is the fallback.
+try:
+    import orjson  # type: ignore
+    ORJSON_AVAILABLE = True
 except ImportError:
-    AZURE_AVAILABLE = False
-    BlobClient = None  # type: ignore
+    orjson = None  # type: ignore
+    ORJSON_AVAILABLE = False
 
 from verifhir.models.audit_record import AuditRecord
 from verifhir.audit.hash_utils import compute_audit_hash
 
 
+def _dumps_indented(obj: Any, ensure_ascii: bool = True) -> bytes:
+    """
+    Two-space indented JSON as UTF-8 bytes, via orjson when installed.
+    orjson never escapes non-ASCII; ensure_ascii only affects the fallback.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=ensure_ascii).encode("utf-8")
+
+
+def _dumps_line(obj: Any) -> bytes:
+    """
+    One compact JSON line (newline-terminated) for the append-only audit log.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _loads(data: bytes) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _log_blob_name(dataset_fingerprint: str) -> str:
+    """Name of a dataset's append-only audit log blob."""
+    return dataset_fingerprint + ".jsonl"
+
+
+def _last_record(tail: bytes, offset: int) -> Optional[Dict[str, Any]]:
+    """
+    Parses the final line of a log tail read from offset, or returns None
+    when the tail may hold only part of that line (read a longer tail).
+    """
+    lines = tail.rstrip(b"\n").split(b"\n")
+    # The first line may be cut off unless the read began at offset 0
+    if len(lines) > 1 or offset == 0:
+        return _loads(lines[-1])
+    return None
+
+
+def _verify_log_chunks(chunks: Iterable[bytes]) -> int:
+    """
+    Streams an audit log (any chunking of its bytes) and checks every
+    record's hash and its link to the record before it. Only one record
+    and one chunk are held at a time. Returns the number of records.
+    """
+    count = 0
+    previous_hash = None
+    remainder = b""
+    for chunk in chunks:
+        lines = (remainder + chunk).split(b"\n")
+        remainder = lines.pop()
+        for line in lines:
+            if not line:
+                continue
+            record = _loads(line)
+            if compute_audit_hash(record) != record.get("record_hash"):
+                raise ValueError(f"Audit record hash mismatch at record {count}")
+            if count and record.get("previous_record_hash") != previous_hash:
+                raise ValueError(f"Audit hash chain broken at record {count}")
+            previous_hash = record.get("record_hash")
+            count += 1
+    if remainder.strip():
+        raise ValueError(f"Audit log truncated after record {count}")
+    return count
+
+
+@functools.cache
+def _cached_property_names(cls: type) -> tuple:
+    # Derived values a dataclass computes lazily (e.g. RiskComponent.explanation)
+    # are still part of what it records, though not fields.
+    return tuple(
+        name
+        for klass in reversed(cls.__mro__)
+        for name, attr in vars(klass).items()
+        if isinstance(attr, functools.cached_property)
+    )
+
+
+def _to_plain(obj: Any) -> Any:
+    """
+    Recursively converts audit contents into JSON-ready builtins.
+    Dataclasses (including slotted ones) become dicts of their fields and
+    cached properties, enums their values, datetimes ISO strings (as in
+    audit_builder), other objects their __dict__.
+    """
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        if isinstance(obj, Enum):
+            return obj.value
+        return obj
+    if isinstance(obj, dict):
+        return {k: _to_plain(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_to_plain(x) for x in obj]
+    if isinstance(obj, Enum):
+        return _to_plain(obj.value)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if is_dataclass(obj):
+        plain = {f.name: _to_plain(getattr(obj, f.name)) for f in fields(obj)}
+        for name in _cached_property_names(type(obj)):
+            plain[name] = _to_plain(getattr(obj, name))
+        return plain
+    return _to_plain(obj.__dict__)
+
+
 class AuditStorage:
     """
     Single persistence boundary for all audit records.
     Enforces hash chaining and immutable writes.
+
+    Meant to be long-lived: one instance holds one ContainerClient, whose
+    HTTP pipeline and connection pool are shared by every blob it writes
+    (the SDK pipeline is safe for concurrent blob operations).
+
+    Each dataset has one append blob, "<dataset_fingerprint>.jsonl", holding
+    its audit records as JSON lines in chain order. Every line carries its
+    own record_hash and previous_record_hash.
     """
 
+    # Bytes read from the end of a log to find its last record; doubled
+    # until a complete line is in view.
+    TAIL_READ_BYTES = 64 * 1024
+
     def __init__(
         self,
         connection_string: str,
         container_name: str,
     ):
-        if not AZURE_AVAILABLE:
-            raise ImportError(
-                "Azure Storage SDK is required for AuditStorage. "
-                "Install it with: pip install azure-storage-blob"
-            )
+        self._sdk = _azure_blob_sdk()
         self.connection_string = connection_string
         self.container_name = container_name
-
-    def _get_blob_client(self, blob_name: str) -> BlobClient:
-        return BlobClient.from_connection_string(
-            conn_str=self.connection_string,
-            container_name=self.container_name,
-            blob_name=blob_name,
+        # Parsed and connected once; blob clients below reuse its pipeline
+        self._container_client = self._sdk.ContainerClient.from_connection_string(
+            conn_str=connection_string,
+            container_name=container_name,
         )
+        # Logs known to exist, so commits skip the create round-trip
+        self._created_logs = set()
+
+    def _get_blob_client(self, blob_name: str) -> "BlobClient":
+        return self._container_client.get_blob_client(blob_name)
 
     def _serialize_audit(self, audit: AuditRecord) -> dict:
         """
         Converts AuditRecord into a JSON-serializable dict.
         """
-        return json.loads(json.dumps(audit, default=lambda o: o.__dict__))
+        return _to_plain(audit)
+
+    def _ensure_log(self, blob_client: "BlobClient", blob_name: str) -> None:
+        if blob_name in self._created_logs:
+            return
+        try:
+            # Create only if missing; never truncate an existing log
+            blob_client.create_append_blob(match_condition=self._sdk.MatchConditions.IfMissing)
+        except self._sdk.ResourceExistsError:
+            pass
+        self._created_logs.add(blob_name)
 
     def get_last_audit(
         self,
         dataset_fingerprint: str,
-    ) -> Optional[AuditRecord]:
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the most recent audit for a dataset, as stored (a plain dict).
+        Only the tail of the dataset's log is downloaded.
+        """
+        blob_client = self._get_blob_client(_log_blob_name(dataset_fingerprint))
+        return self._read_tail(blob_client)[0]
+
+    def _read_tail(self, blob_client: "BlobClient") -> Tuple[Optional[Dict[str, Any]], int]:
+        """
+        The log's last record (None if the log is missing or empty) and the
+        log size it was read at.
+        """
+        try:
+            size = blob_client.get_blob_properties().size
+        except self._sdk.ResourceNotFoundError:
+            return None, 0
+        if not size:
+            return None, 0
+
+        length = self.TAIL_READ_BYTES
+        while True:
+            offset = max(0, size - length)
+            tail = blob_client.download_blob(offset=offset, length=size - offset).readall()
+            record = _last_record(tail, offset)
+            if record is not None:
+                return record, size
+            length *= 2
+
+    def verify_chain(self, dataset_fingerprint: str) -> int:
         """
-        Fetch the most recent audit for a dataset.
-        For MVP: return None or implement lookup if available.
+        Verifies a dataset's whole audit log in one streaming pass, holding
+        one downloaded chunk at a time however long the chain. Returns the
+        number of records; raises ValueError at the first bad record.
         """
-        # MVP: assume sequential writes; return None
-        return None
+        blob_client = self._get_blob_client(_log_blob_name(dataset_fingerprint))
+        try:
+            downloader = blob_client.download_blob()
+        except self._sdk.ResourceNotFoundError:
+            return 0
+        return _verify_log_chunks(downloader.chunks())
 
     def commit_record(self, audit: AuditRecord) -> None:
         """
-        Enforces hash chaining and writes audit immutably to Blob Storage (WORM-ready).
+        Enforces hash chaining and appends the audit to its dataset's
+        append-only log in Blob Storage (WORM-ready).
         """
 
         # --- Integrity: hash chaining ---
-        last_audit = self.get_last_audit(audit.dataset_fingerprint)
+        blob_name = _log_blob_name(audit.dataset_fingerprint)
+        blob_client = self._get_blob_client(blob_name)
+        last_audit, log_size = self._read_tail(blob_client)
 
         if last_audit:
-            if audit.previous_record_hash != last_audit.record_hash:
+            if audit.previous_record_hash != last_audit.get("record_hash"):
                 raise ValueError("Audit hash chain broken")
 
         # --- Canonical hash verification ---
@@ -77,15 +295,233 @@ class AuditStorage:
         if computed_hash != audit.record_hash:
             raise ValueError("Audit record hash mismatch")
 
-        # --- Immutable write ---
-        blob_client = self._get_blob_client(
-            blob_name=f"{audit.audit_id}.json"
-        )
+        # --- Immutable write (append blobs cannot be overwritten) ---
+        self._ensure_log(blob_client, blob_name)
+
+        # Encoded bytes with an explicit length: the SDK sends the buffer
+        # as-is with Content-Length set, no re-encode or size probing.
+        # appendpos_condition makes the append fail if another writer has
+        # extended the log since its tail was checked above.
+        line = _dumps_line(audit_dict)
+        try:
+            blob_client.append_block(line, length=len(line), appendpos_condition=log_size)
+        except self._sdk.ResourceModifiedError as e:
+            raise ValueError("Audit hash chain broken") from e
 
-        blob_client.upload_blob(
-            data=json.dumps(audit_dict, indent=2),
-            overwrite=False  # REQUIRED for immutability
+
+class AsyncAuditStorage:
+    """
+    asyncio counterpart of AuditStorage for bulk ingest.
+
+    Same log layout and checks. Hash and chain checks run when a record is
+    submitted, so chain order is fixed at submission; writes are then group
+    committed by one background task, which takes up to batch_size queued
+    records (waiting flush_interval seconds for more to arrive) and appends
+    each dataset's lines as one block, datasets in parallel. commit_record
+    returns once its own record has been appended. As in AuditStorage, each
+    append is conditional on the log size the chain was checked against, so
+    a concurrent writer voids the pending records instead of forking the
+    chain.
+
+    Use as an async context manager, or await close() when done.
+    """
+
+    TAIL_READ_BYTES = AuditStorage.TAIL_READ_BYTES
+    # Append Block size limit; larger batches are split across blocks
+    MAX_APPEND_BYTES = 4 * 1024 * 1024
+
+    def __init__(
+        self,
+        connection_string: str,
+        container_name: str,
+        batch_size: int = 100,
+        flush_interval: float = 0.05,
+    ):
+        self._sdk = _azure_blob_aio_sdk()
+        self.connection_string = connection_string
+        self.container_name = container_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._container_client = self._sdk.ContainerClient.from_connection_string(
+            conn_str=connection_string,
+            container_name=container_name,
         )
+        self._created_logs = set()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._chain_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        # dataset -> record_hash of its newest accepted record (None: empty log)
+        self._last_hashes: Dict[str, Optional[str]] = {}
+        # dataset -> log size this instance expects, i.e. the size its chain
+        # head was read at plus every block it has appended since. Appends
+        # are conditional on it, so another writer cannot fork the chain.
+        self._log_sizes: Dict[str, int] = {}
+        # dataset -> bumped when an append fails, voiding records queued
+        # behind the lost ones
+        self._generations: Dict[str, int] = {}
+
+    async def __aenter__(self) -> "AsyncAuditStorage":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def get_last_audit(
+        self,
+        dataset_fingerprint: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the most recent stored audit for a dataset (a plain dict).
+        """
+        blob_client = self._container_client.get_blob_client(_log_blob_name(dataset_fingerprint))
+        return (await self._read_tail(blob_client))[0]
+
+    async def _read_tail(self, blob_client) -> Tuple[Optional[Dict[str, Any]], int]:
+        """AuditStorage._read_tail() for the aio client."""
+        try:
+            size = (await blob_client.get_blob_properties()).size
+        except self._sdk.ResourceNotFoundError:
+            return None, 0
+        if not size:
+            return None, 0
+
+        length = self.TAIL_READ_BYTES
+        while True:
+            offset = max(0, size - length)
+            downloader = await blob_client.download_blob(offset=offset, length=size - offset)
+            record = _last_record(await downloader.readall(), offset)
+            if record is not None:
+                return record, size
+            length *= 2
+
+    async def commit_record(self, audit: AuditRecord) -> None:
+        """
+        Checks the audit's hash and chain link, then waits for it to be
+        appended to its dataset's log.
+        """
+        audit_dict = _to_plain(audit)
+        if compute_audit_hash(audit_dict) != audit.record_hash:
+            raise ValueError("Audit record hash mismatch")
+
+        dataset = audit.dataset_fingerprint
+        async with self._chain_lock:
+            if dataset not in self._last_hashes:
+                blob_client = self._container_client.get_blob_client(_log_blob_name(dataset))
+                last_audit, self._log_sizes[dataset] = await self._read_tail(blob_client)
+                self._last_hashes[dataset] = last_audit.get("record_hash") if last_audit else None
+            last_hash = self._last_hashes[dataset]
+            if last_hash is not None and audit.previous_record_hash != last_hash:
+                raise ValueError("Audit hash chain broken")
+            self._last_hashes[dataset] = audit.record_hash
+
+            done = asyncio.get_running_loop().create_future()
+            self._queue.put_nowait(
+                (dataset, _dumps_line(audit_dict), self._generations.get(dataset, 0), done)
+            )
+
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run())
+        await done
+
+    async def close(self) -> None:
+        """
+        Writes every queued record, then releases the connection pool.
+        """
+        if self._flusher is not None:
+            await self._queue.join()
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self._container_client.close()
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            if self._queue.qsize() < self.batch_size - 1:
+                # Let concurrent submitters join this commit
+                await asyncio.sleep(self.flush_interval)
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            await self._flush(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _flush(self, batch) -> None:
+        pending: Dict[str, list] = {}
+        for dataset, line, generation, done in batch:
+            if generation != self._generations.get(dataset, 0):
+                # Chained to a record whose append failed
+                if not done.done():
+                    done.set_exception(ValueError("Audit hash chain broken"))
+                continue
+            pending.setdefault(dataset, []).append((line, done))
+
+        await asyncio.gather(*(
+            self._append(dataset, items) for dataset, items in pending.items()
+        ))
+
+    async def _append(self, dataset: str, items: list) -> None:
+        blob_name = _log_blob_name(dataset)
+        blob_client = self._container_client.get_blob_client(blob_name)
+        try:
+            if blob_name not in self._created_logs:
+                try:
+                    await blob_client.create_append_blob(match_condition=self._sdk.MatchConditions.IfMissing)
+                except self._sdk.ResourceExistsError:
+                    pass
+                self._created_logs.add(blob_name)
+        except Exception as e:
+            self._void(dataset, [done for _, done in items], e)
+            return
+
+        # Split into blocks under the Append Block limit. Each block's records
+        # are settled as soon as it lands, so a later failure only affects
+        # the records that were actually lost.
+        blocks, parts, waiters, size = [], [], [], 0
+        for line, done in items:
+            if parts and size + len(line) > self.MAX_APPEND_BYTES:
+                blocks.append((b"".join(parts), size, waiters))
+                parts, waiters, size = [], [], 0
+            parts.append(line)
+            waiters.append(done)
+            size += len(line)
+        blocks.append((b"".join(parts), size, waiters))
+
+        for i, (payload, size, waiters) in enumerate(blocks):
+            try:
+                await blob_client.append_block(
+                    payload, length=size, appendpos_condition=self._log_sizes[dataset]
+                )
+            except Exception as e:
+                error = e
+                if isinstance(e, self._sdk.ResourceModifiedError):
+                    # Another writer extended the log since its head was read
+                    error = ValueError("Audit hash chain broken")
+                    error.__cause__ = e
+                self._void(dataset, [w for _, _, ws in blocks[i:] for w in ws], error)
+                return
+            self._log_sizes[dataset] += size
+            for done in waiters:
+                if not done.done():
+                    done.set_result(None)
+
+    def _void(self, dataset: str, waiters: list, error: Exception) -> None:
+        # Re-read the chain head from storage on the next submission
+        self._generations[dataset] = self._generations.get(dataset, 0) + 1
+        self._last_hashes.pop(dataset, None)
+        self._log_sizes.pop(dataset, None)
+        for done in waiters:
+            if not done.done():
+                done.set_exception(error)
+
+
+# Relative to the working directory, as before. Created on the first
+# commit that finds it missing, not checked on every commit.
+VAULT_DIR = pathlib.Path("secure_vault")
 
 
 def commit_record(
@@ -99,24 +535,24 @@ def commit_record(
     This is for remediation/redaction records, not audit records.
     Returns a file ID for reference.
     """
-    import pathlib
-    
-    # Create secure_vault directory if it doesn't exist
-    vault_dir = pathlib.Path("secure_vault")
-    vault_dir.mkdir(exist_ok=True)
-    
     # Generate deterministic record ID from content
-    content_hash = hashlib.sha256(
-        f"{original_text}{redacted_text}".encode()
-    ).hexdigest()[:16]
+    # Fed in two parts: same digest as hashing the concatenation, without
+    # building a second copy of both texts. The digest only names the file,
+    # so it is flagged as non-security use (allowed under FIPS-mode OpenSSL).
+    hasher = hashlib.sha256(usedforsecurity=False)
+    hasher.update(original_text.encode())
+    hasher.update(redacted_text.encode())
+    content_hash = hasher.hexdigest()[:16]
     
-    timestamp = int(datetime.utcnow().timestamp())
+    # One clock read for both the record ID and the stored timestamp
+    now = datetime.utcnow()
+    timestamp = int(now.timestamp())
     record_id = f"{content_hash}_{timestamp}"
     
     # Build record structure
     record = {
         "record_id": content_hash,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": now.isoformat(),
         "status": "COMMITTED",
         "metadata": metadata,
         "data": {
@@ -126,8 +562,13 @@ def commit_record(
     }
     
     # Write to secure vault
-    file_path = vault_dir / f"record_{record_id}.json"
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(record, f, indent=2, ensure_ascii=False)
+    file_path = VAULT_DIR / f"record_{record_id}.json"
+    payload = _dumps_indented(record, ensure_ascii=False)
+    try:
+        file_path.write_bytes(payload)
+    except FileNotFoundError:
+        # Vault directory missing (first commit in this working directory)
+        VAULT_DIR.mkdir(exist_ok=True)
+        file_path.write_bytes(payload)
     
     return record_id
@@ -6,12 +6,40 @@ No PHI logging. No payloads. No raw text.
 """
 import os
 import logging
+from types import MappingProxyType
 from typing import Literal
-from azure.monitor.opentelemetry import configure_azure_monitor
 from opentelemetry.trace import get_current_span
 
 logger = logging.getLogger("verifhir.telemetry")
 
+# Event names: the fixed telemetry schema, one constant per event.
+_EVT_DECISION = "verifhir.decision"
+_EVT_CONVERTER_STATUS = "verifhir.converter_status"
+_EVT_OCR_CONFIDENCE = "verifhir.ocr_confidence"
+_EVT_EXCEPTION = "verifhir.exception"
+_EVT_RISK_BAND = "verifhir.risk_band"
+
+# Allowed values are checked by hash lookup (the literals are interned
+# compile-time constants already, so sys.intern would add nothing).
+_DECISION_PATHS = frozenset(("rules", "ml-sensor", "hybrid"))
+
+# Categorical events carry one fixed attribute drawn from a closed set, so
+# every possible attribute mapping is built once here (read-only; the SDK
+# copies attributes into its own container). Emitters fall back to a fresh
+# dict for out-of-set values, which only get past the asserts under -O.
+_CONVERTER_STATUS_ATTRIBUTES = {
+    status: MappingProxyType({"converter_status": status})
+    for status in ("success", "failure")
+}
+_OCR_BUCKET_ATTRIBUTES = {
+    bucket: MappingProxyType({"ocr_confidence_bucket": bucket})
+    for bucket in ("0.7-0.8", "0.8-0.9", "0.9+")
+}
+_RISK_BAND_ATTRIBUTES = {
+    band: MappingProxyType({"risk_band": band})
+    for band in ("LOW", "MEDIUM", "HIGH")
+}
+
 def init_telemetry():
     """
     Initialize Azure Application Insights via OpenTelemetry.
@@ -22,6 +50,9 @@ def init_telemetry():
     if not connection_string:
         return  # Telemetry disabled (local / tests)
 
+    # Imported only when telemetry is enabled: the exporter stack is heavy
+    from azure.monitor.opentelemetry import configure_azure_monitor
+
     configure_azure_monitor(
         connection_string=connection_string
     )
@@ -50,15 +81,17 @@ def emit_decision_telemetry(
     # DAY 37 Fix 3: Enforce Telemetry Discipline (Defensive Hardening)
     assert isinstance(decision_latency_ms, int), "decision_latency_ms must be int"
     assert isinstance(risk_score, float), "risk_score must be float"
-    assert decision_path in ("rules", "ml-sensor", "hybrid"), f"decision_path must be one of ('rules', 'ml-sensor', 'hybrid'), got {decision_path}"
+    assert decision_path in _DECISION_PATHS, f"decision_path must be one of ('rules', 'ml-sensor', 'hybrid'), got {decision_path}"
     assert isinstance(fallback_triggered, bool), "fallback_triggered must be bool"
     
     span = get_current_span()
-    if not span:
+    # get_current_span() never returns None: with no active span it returns
+    # a non-recording one. Skip building attributes for it.
+    if not span.is_recording():
         return  # No active span - telemetry disabled or not in trace context
 
     span.add_event(
-        name="verifhir.decision",
+        name=_EVT_DECISION,
         attributes={
             "decision_latency_ms": decision_latency_ms,
             "risk_score": risk_score,
@@ -75,17 +108,15 @@ def emit_converter_status(status: Literal["success", "failure"]):
     Emit converter status (success/failure only).
     Never logs raw input, HL7 content, or FHIR payloads.
     """
-    assert status in ("success", "failure"), f"status must be 'success' or 'failure', got {status}"
+    assert status in _CONVERTER_STATUS_ATTRIBUTES, f"status must be 'success' or 'failure', got {status}"
     
     span = get_current_span()
-    if not span:
+    if not span.is_recording():
         return
     
     span.add_event(
-        name="verifhir.converter_status",
-        attributes={
-            "converter_status": status,
-        }
+        name=_EVT_CONVERTER_STATUS,
+        attributes=_CONVERTER_STATUS_ATTRIBUTES.get(status) or {"converter_status": status},
     )
 
 
@@ -99,17 +130,15 @@ def emit_ocr_confidence_bucket(bucket: Literal["0.7-0.8", "0.8-0.9", "0.9+"]):
     TASK 2B: Distribution signal only - countable categories, not numeric aggregates.
     Operational telemetry: validates "system receives readable artifacts and fails safely."
     """
-    assert bucket in ("0.7-0.8", "0.8-0.9", "0.9+"), f"bucket must be one of ('0.7-0.8', '0.8-0.9', '0.9+'), got {bucket}"
+    assert bucket in _OCR_BUCKET_ATTRIBUTES, f"bucket must be one of ('0.7-0.8', '0.8-0.9', '0.9+'), got {bucket}"
     
     span = get_current_span()
-    if not span:
+    if not span.is_recording():
         return
     
     span.add_event(
-        name="verifhir.ocr_confidence",
-        attributes={
-            "ocr_confidence_bucket": bucket,
-        }
+        name=_EVT_OCR_CONFIDENCE,
+        attributes=_OCR_BUCKET_ATTRIBUTES.get(bucket) or {"ocr_confidence_bucket": bucket},
     )
 
 
@@ -131,11 +160,11 @@ def emit_exception_telemetry(exception: Exception):
     Judge-safe.
     """
     span = get_current_span()
-    if not span:
+    if not span.is_recording():
         return
     
     span.add_event(
-        name="verifhir.exception",
+        name=_EVT_EXCEPTION,
         attributes={
             "exception_type": scrub_exception_for_telemetry(exception)
         }
@@ -158,15 +187,13 @@ def emit_risk_band(band: Literal["LOW", "MEDIUM", "HIGH"]):
     
     Never shown in UI. Never affects decision logic.
     """
-    assert band in ("LOW", "MEDIUM", "HIGH"), f"band must be one of ('LOW', 'MEDIUM', 'HIGH'), got {band}"
+    assert band in _RISK_BAND_ATTRIBUTES, f"band must be one of ('LOW', 'MEDIUM', 'HIGH'), got {band}"
     
     span = get_current_span()
-    if not span:
+    if not span.is_recording():
         return
     
     span.add_event(
-        name="verifhir.risk_band",
-        attributes={
-            "risk_band": band,
-        }
+        name=_EVT_RISK_BAND,
+        attributes=_RISK_BAND_ATTRIBUTES.get(band) or {"risk_band": band},
     )
\ No newline at end of file